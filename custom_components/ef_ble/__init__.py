@@ -18,6 +18,7 @@ from . import eflib
 from .config_flow import CONF_COLLECT_PACKETS, ConfLogOptions, LogOptions, PacketVersion
 from .const import (
     CONF_CONNECTION_TIMEOUT,
+    CONF_FAST_HANDSHAKE,
     CONF_PACKET_VERSION,
     CONF_UPDATE_PERIOD,
     CONF_USER_ID,
@@ -84,6 +85,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: DeviceConfigEntry) -> bo
     packet_collection_enabled = merged_options.get(
         CONF_COLLECT_PACKETS, eflib.is_unsupported(device)
     )
+    fast_handshake = merged_options.get(CONF_FAST_HANDSHAKE, False)
     issue_id = f"{entry.entry_id}_max_connection_attempts"
 
     try:
@@ -93,6 +95,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: DeviceConfigEntry) -> bo
             .with_disabled_reconnect()
             .with_packet_version(packet_version.to_num())
             .with_enabled_packet_diagnostics(packet_collection_enabled)
+            .with_fast_handshake(fast_handshake)
             .connect(user_id, timeout=timeout)
         )
         state = await device.wait_until_authenticated_or_error(raise_on_error=True)
@@ -182,9 +185,11 @@ async def _update_listener(hass: HomeAssistant, entry: DeviceConfigEntry):
     packet_collection = merged_options.get(
         CONF_COLLECT_PACKETS, eflib.is_unsupported(device)
     )
+    fast_handshake = merged_options.get(CONF_FAST_HANDSHAKE, False)
 
     (
         device.with_update_period(period=update_period)
         .with_logging_options(ConfLogOptions.from_config(merged_options))
         .with_enabled_packet_diagnostics(packet_collection)
+        .with_fast_handshake(fast_handshake)
     )
@@ -38,6 +38,7 @@ from .const import (
     CONF_COLLECT_PACKETS,
     CONF_COLLECT_PACKETS_AMOUNT,
     CONF_CONNECTION_TIMEOUT,
+    CONF_FAST_HANDSHAKE,
     CONF_LOG_BLEAK,
     CONF_LOG_CONNECTION,
     CONF_LOG_ENCRYPTED_PAYLOADS,
@@ -504,6 +505,7 @@ class OptionsFlowHandler(OptionsFlow):
             CONF_COLLECT_PACKETS: merged_entry.get(
                 CONF_COLLECT_PACKETS, eflib.is_unsupported(device)
             ),
+            CONF_FAST_HANDSHAKE: merged_entry.get(CONF_FAST_HANDSHAKE, False),
         }
 
         return self.async_show_form(
@@ -522,6 +524,7 @@ class OptionsFlowHandler(OptionsFlow):
                             else 100
                         ),
                     )
+                    .optional(CONF_FAST_HANDSHAKE, bool, False)
                     .update(ConfLogOptions.schema(merged_entry, collapsed=False))
                     .build()
                 ),
@@ -0,0 +1,50 @@
+from Crypto.Cipher import AES
+from Crypto.Util.Padding import pad, unpad
+
+type Buffer = bytes | bytearray | memoryview
+
+
+class SessionCipher:
+    """
+    AES-CBC cipher for the frames of one connection session
+
+    Every frame is encrypted independently with the same key and IV. The AES key
+    schedule is expanded once per session and kept in a stateless ECB engine, so frames
+    don't have to create a new cipher object each.
+
+    CBC decryption doesn't chain, every plaintext block is
+    `D(ciphertext[i]) ^ ciphertext[i - 1]` with the IV in place of the block before the
+    first one, so the whole frame is decrypted with a single ECB call and one xor with
+    the ciphertext shifted by a block.
+    """
+
+    __slots__ = ("_ecb", "_iv", "_iv_int", "_key")
+
+    def __init__(self, key: bytes, iv: bytes) -> None:
+        self._key = key
+        self._iv = iv
+        self._iv_int = int.from_bytes(iv)
+        self._ecb = AES.new(key, AES.MODE_ECB)
+
+    def encrypt_frame(self, payload: Buffer) -> bytes:
+        """Pad and encrypt payload of a single frame"""
+        # Encryption has to chain blocks one after another, which is faster to leave to
+        # the CBC mode than to drive the ECB engine block by block from python
+        return AES.new(self._key, AES.MODE_CBC, self._iv).encrypt(
+            pad(payload, AES.block_size)
+        )
+
+    def decrypt_frame(self, encrypted_payload: Buffer) -> bytes:
+        """Decrypt and unpad payload of a single frame"""
+        size = len(encrypted_payload)
+        if size == 0 or size % AES.block_size:
+            raise ValueError(
+                f"Encrypted payload size {size} is not a multiple of "
+                f"{AES.block_size} bytes"
+            )
+
+        decrypted = int.from_bytes(self._ecb.decrypt(encrypted_payload))
+        chain = (self._iv_int << (size - AES.block_size) * 8) | int.from_bytes(
+            encrypted_payload[: size - AES.block_size]
+        )
+        return unpad((decrypted ^ chain).to_bytes(size), AES.block_size)
@@ -0,0 +1,96 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+
+type Setter = Callable[[], Awaitable[bool]]
+
+
+class CoalescingWriter:
+    """
+    Debounces writes of a single property, so only the latest value is sent
+
+    Writes requested within the debounce window replace each other and only the last
+    one is sent when the window ends. There is at most one write in flight, values
+    requested while it is being sent are coalesced into the next window. All callers
+    of coalesced writes receive the result of the write that was actually sent.
+    """
+
+    def __init__(self, delay: float = 0.3) -> None:
+        self._delay = delay
+        self._pending: Setter | None = None
+        self._pending_result: asyncio.Future[bool] | None = None
+        self._task: asyncio.Task | None = None
+
+        self.requested = 0
+        self.sent = 0
+
+    @property
+    def coalescing_ratio(self) -> float | None:
+        """Number of requested writes per one sent write"""
+        return self.requested / self.sent if self.sent else None
+
+    async def write(self, setter: Setter) -> bool:
+        """
+        Request write that will be sent after the debounce window
+
+        Parameters
+        ----------
+        setter
+            Function that sends the value to the device
+
+        Return
+        -------
+        Result of the setter that was sent, which might be a later one
+        """
+        self.requested += 1
+        self._pending = setter
+        if self._pending_result is None:
+            self._pending_result = asyncio.get_running_loop().create_future()
+        result = self._pending_result
+
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+        # Caller giving up on waiting must not cancel write shared with other callers
+        return await asyncio.shield(result)
+
+    def cancel(self):
+        """Drop pending write and stop the one in flight, their callers receive False"""
+        self._fail(self._pending_result)
+        self._pending = self._pending_result = None
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self):
+        result = None
+        try:
+            while self._pending is not None:
+                await asyncio.sleep(self._delay)
+                setter, result = self._pending, self._pending_result
+                self._pending = self._pending_result = None
+                if setter is None or result is None:
+                    return
+
+                self.sent += 1
+                try:
+                    result.set_result(await setter())
+                except Exception as e:  # noqa: BLE001
+                    result.set_exception(e)
+        finally:
+            # Callers are waiting on the shielded futures even if this task is cancelled
+            self._fail(result)
+            if self._task is asyncio.current_task():
+                self._fail(self._pending_result)
+                self._pending = self._pending_result = None
+
+    @staticmethod
+    def _fail(result: asyncio.Future[bool] | None):
+        if result is not None and not result.done():
+            result.set_result(False)
+
+    def stats(self) -> dict[str, float | int | None]:
+        return {
+            "requested": self.requested,
+            "sent": self.sent,
+            "coalescing_ratio": self.coalescing_ratio,
+        }
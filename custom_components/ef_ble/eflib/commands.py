@@ -6,6 +6,7 @@ from dataclasses import dataclass
 from .devicebase import DeviceBase
 from .packet import Packet
 from .pb import utc_sys_pb2
+from .writequeue import WritePriority
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -23,7 +24,7 @@ class TimeCommands:
         payload = utcs.SerializeToString()
         packet = Packet(0x21, 0x0B, 0x01, 0x55, payload, 0x01, 0x01, 0x13)
 
-        await self.device._conn.sendPacket(packet)
+        await self.device._conn.sendPacket(packet, WritePriority.TIME_SYNC)
 
     async def sendRTCRespond(self):
         """Send RTC timestamp seconds and TZ as respond to device's request"""
@@ -57,7 +58,7 @@ class TimeCommands:
             0x03,
         )
 
-        await self.device._conn.sendPacket(packet)
+        await self.device._conn.sendPacket(packet, WritePriority.TIME_SYNC)
 
     async def sendRTCCheck(self):
         """Send command to check RTC of the device"""
@@ -91,7 +92,7 @@ class TimeCommands:
             0x03,
         )
 
-        await self.device._conn.sendPacket(packet)
+        await self.device._conn.sendPacket(packet, WritePriority.TIME_SYNC)
 
     def async_send_all(self):
         self.device._conn._add_task(self.sendUtcTime())
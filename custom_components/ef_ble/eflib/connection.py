@@ -4,13 +4,20 @@ import functools
 import hashlib
 import logging
 import struct
+import time
 import traceback
 from collections import deque
-from collections.abc import Awaitable, Callable, Collection, Coroutine, MutableSequence
+from collections.abc import (
+    Awaitable,
+    Callable,
+    Collection,
+    Coroutine,
+    Hashable,
+    MutableSequence,
+)
 from enum import StrEnum, auto
 from functools import cached_property
 
-import ecdsa
 from bleak import BleakClient
 from bleak.backends.characteristic import BleakGATTCharacteristic
 from bleak.backends.device import BLEDevice
@@ -20,16 +27,14 @@ from bleak_retry_connector import (
     BleakNotFoundError,
     establish_connection,
 )
-from Crypto.Cipher import AES
-from Crypto.Util.Padding import pad, unpad
 
-from . import keydata
+from . import ecdh, keydata
+from .cipher import SessionCipher
 from .crc import crc16
-from .encpacket import EncPacket
+from .encpacket import EncPacket, EncPacketReassembler
 from .exceptions import (
     AuthFailedError,
     ConnectionTimeout,
-    EncPacketParseError,
     FailedToAuthenticate,
     MaxConnectionAttemptsReached,
     MaxReconnectAttemptsReached,
@@ -40,9 +45,12 @@ from .listeners import ListenerGroup
 from .logging_util import ConnectionLogger, LogOptions
 from .packet import Packet
 from .props.utils import classproperty
+from .writequeue import QueuedWrite, WritePriority, WriteQueue
 
 MAX_RECONNECT_ATTEMPTS = 2
 MAX_CONNECTION_ATTEMPTS = 10
+COMMAND_TIMEOUT = 5
+WRITE_RETRIES = 3
 
 type DisconnectListener = Callable[[Exception | type[Exception] | None], None]
 
@@ -157,6 +165,9 @@ class ConnectionState(StrEnum):
 type ConnectionStateListener = Callable[[ConnectionState], None]
 type PacketReceivedListener = Callable[[bytes], None]
 type PacketParsedListener = Callable[[Packet], None]
+type NotificationHandler = Callable[
+    [BleakGATTCharacteristic, bytearray], Awaitable[None]
+]
 
 
 class Connection:
@@ -193,7 +204,25 @@ class Connection:
         self._disconnected = asyncio.Event()
         self._retry_on_disconnect = False
         self._retry_on_disconnect_delay = 10
-        self._enc_packet_buffer = b""
+        self._enc_packet_buffer = EncPacketReassembler()
+        self._write_queue = WriteQueue()
+        self._writer_task: asyncio.Task | None = None
+
+        self._seq = 0
+        # Futures of sent packets waiting for response, by command set and sequence
+        # number. Response doesn't have to come from the packet destination, e.g. Wave 3
+        # commands are sent to 0x14 but the device reports from 0x42
+        self._pending_responses: dict[
+            tuple[int, bytes], asyncio.Future[Packet | None]
+        ] = {}
+        self._command_round_trips: deque[float] = deque(maxlen=50)
+        self._commands_timed_out = 0
+
+        self._fast_handshake = False
+        self._skip_auth_status = False
+        self._request_sent_at = 0.0
+        self._session_key_round_trip = 0.0
+        self._handshake_time_saved: float | None = None
 
         self._tasks: set[asyncio.Task] = set()
 
@@ -212,6 +241,16 @@ class Connection:
         self._on_packet_data_received = ListenerGroup[PacketReceivedListener]()
         self._on_packet_parsed = ListenerGroup[PacketParsedListener]()
 
+        # Notifications are subscribed once per connection, every state that waits for
+        # a response routes it to its own handler
+        self._notification_handlers: dict[ConnectionState, NotificationHandler] = {
+            ConnectionState.PUBLIC_KEY_EXCHANGE: self.initBleSessionKeyHandler,
+            ConnectionState.REQUESTING_SESSION_KEY: self.getKeyInfoReqHandler,
+            ConnectionState.REQUESTING_AUTH_STATUS: self.getAuthStatusHandler,
+            ConnectionState.AUTHENTICATING: self.listenForDataHandler,
+            ConnectionState.AUTHENTICATED: self.listenForDataHandler,
+        }
+
         self._connection_state: ConnectionState = None  # pyright: ignore[reportAttributeAccessIssue]
         self._set_state(ConnectionState.CREATED)
 
@@ -219,6 +258,29 @@ class Connection:
     def is_connected(self) -> bool:
         return self._client is not None and self._client.is_connected
 
+    @property
+    def write_queue_stats(self):
+        """Depth and latency statistics of the GATT write queue"""
+        return self._write_queue.stats()
+
+    @property
+    def command_stats(self):
+        """Round trip statistics of commands sent with `sendConfirmedPacket`"""
+        round_trips = sorted(self._command_round_trips)
+        return {
+            "confirmed": len(round_trips),
+            "timed_out": self._commands_timed_out,
+            "round_trip_median_ms": (
+                round_trips[len(round_trips) // 2] * 1000 if round_trips else None
+            ),
+            "round_trip_max_ms": round_trips[-1] * 1000 if round_trips else None,
+        }
+
+    @property
+    def handshake_time_saved(self) -> float | None:
+        """Seconds saved by fast handshake on the last connect, None if not used"""
+        return self._handshake_time_saved
+
     def _add_listener(self, collection: MutableSequence[Callable], listener: Callable):
         collection.append(listener)
 
@@ -269,6 +331,23 @@ class Connection:
         self._reconnect = not is_disabled
         return self
 
+    def with_fast_handshake(self, enabled: bool = True, skip_auth_status: bool = False):
+        """
+        Authenticate without waiting for the auth status response
+
+        Parameters
+        ----------
+        enabled
+            Send authentication right after the auth status request instead of waiting
+            for its response
+        skip_auth_status
+            Don't request auth status at all, only for devices that are known to
+            authenticate without it
+        """
+        self._fast_handshake = enabled
+        self._skip_auth_status = skip_auth_status
+        return self
+
     async def connect(
         self,
         max_attempts: int = MAX_CONNECT_ATTEMPTS,
@@ -290,6 +369,12 @@ class Connection:
 
         self._connected.clear()
         self._disconnected.clear()
+        self._enc_packet_buffer.reset()
+        # Queued frames are encrypted with the previous session key
+        self._write_queue.clear()
+        self._handshake_time_saved = None
+        # Key pair for the handshake is generated while the link is being established
+        ecdh.key_pair_pool.refill()
 
         error = None
         try:
@@ -341,6 +426,11 @@ class Connection:
         self._logger.log_filtered(
             LogOptions.CONNECTION_DEBUG, "MTU: %d", self._client.mtu_size
         )
+        await self._client.start_notify(
+            Connection.NOTIFY_CHARACTERISTIC, self._notificationHandler
+        )
+        if self._writer_task is None or self._writer_task.done():
+            self._writer_task = self._add_task(self._writer())
         self._logger.info("Init completed, starting auth routine...")
 
         await self.initBleSessionKey()
@@ -417,6 +507,7 @@ class Connection:
 
         self._reconnect_attempt = 0
         self._cancel_tasks()
+        self._write_queue.clear()
 
         if self._client is not None and self._client.is_connected:
             self._set_state(ConnectionState.DISCONNECTING)
@@ -518,20 +609,6 @@ class Connection:
         if state.is_error:
             self._notify_disconnect(exc)
 
-    # En/Decrypt functions must create AES object every time, because
-    # it saves the internal state after encryption and become useless
-    async def decryptShared(self, encrypted_payload: str):
-        aes_shared = AES.new(self._shared_key, AES.MODE_CBC, self._iv)
-        return unpad(aes_shared.decrypt(encrypted_payload), AES.block_size)
-
-    async def decryptSession(self, encrypted_payload: str):
-        aes_session = AES.new(self._session_key, AES.MODE_CBC, self._iv)
-        return unpad(aes_session.decrypt(encrypted_payload), AES.block_size)
-
-    async def encryptSession(self, payload: str):
-        aes_session = AES.new(self._session_key, AES.MODE_CBC, self._iv)
-        return aes_session.encrypt(pad(payload, AES.block_size))
-
     async def genSessionKey(self, seed: bytes, srand: bytes):
         """Implements the necessary part of the logic, rest is skipped"""
         data_num = [0, 0, 0, 0]
@@ -578,7 +655,10 @@ class Connection:
         payload_crc = data[data_end - 2 : data_end]
 
         # Check the payload CRC16
-        if crc16(header + payload_data) != struct.unpack("<H", payload_crc)[0]:
+        if (
+            crc16(memoryview(data)[: data_end - 2])
+            != struct.unpack("<H", payload_crc)[0]
+        ):
             error_msg = (
                 "parseSimple: Unable to parse simple packet - incorrect CRC16: %r"
             )
@@ -589,62 +669,36 @@ class Connection:
 
         return payload_data
 
-    async def parseEncPackets(self, data: str) -> list[Packet]:
+    async def parseEncPackets(self, data: bytes) -> list[Packet]:
         """Deserializes bytes stream into a list of Packets"""
-        # In case there are leftovers from previous processing - adding them to current
-        # data
-        if self._enc_packet_buffer:
-            data = self._enc_packet_buffer + data
-            self._enc_packet_buffer = b""
-
         self._logger.log_filtered(
             LogOptions.ENCRYPTED_PAYLOADS,
             "parseEncPackets: Data: %r",
             bytearray(data).hex(),
         )
-        if len(data) < 8:
-            error_msg = (
-                "parseEncPackets: Unable to parse encrypted packet - too small: %r"
-            )
-            self._logger.error(error_msg, bytearray(data).hex())
-            self._last_errors.append(error_msg % bytearray(data).hex())
-            raise EncPacketParseError
-
-        # Data can contain multiple EncPackets and even incomplete ones, so walking
-        # through
-        packets = []
-        while data:
-            if not data.startswith(EncPacket.PREFIX):
-                error_msg = (
-                    "parseEncPackets: Unable to parse encrypted packet - prefix is "
-                    "incorrect: %r"
-                )
-                self._logger.error(error_msg, bytearray(data).hex())
-                self._last_errors.append(error_msg % bytearray(data).hex())
-                return packets
-
-            header = data[0:6]
-            data_end = 6 + struct.unpack("<H", header[4:6])[0]
-            if data_end > len(data):
-                self._enc_packet_buffer += data
-                break
 
-            payload_data = data[6 : data_end - 2]
-            payload_crc = data[data_end - 2 : data_end]
+        # Data can contain multiple EncPackets and even incomplete ones, leftovers are
+        # kept in the buffer until the rest of the frame arrives
+        buffer = self._enc_packet_buffer
+        discarded_bytes = buffer.discarded_bytes
 
-            # Move to next data packet
-            data = data[data_end:]
+        packets = []
+        for frame in buffer.feed(data):
+            payload_data = frame[6:-2]
 
             try:
                 # Check the packet CRC16
-                if crc16(header + payload_data) != struct.unpack("<H", payload_crc)[0]:
+                if (
+                    crc16(frame[:-2])
+                    != struct.unpack_from("<H", frame, len(frame) - 2)[0]
+                ):
                     error_msg = "Unable to parse encrypted packet - incorrect CRC16: %r"
-                    self._logger.error(error_msg, bytearray(payload_data).hex())
-                    self._last_errors.append(error_msg % bytearray(payload_data).hex())
+                    self._logger.error(error_msg, payload_data.hex())
+                    self._last_errors.append(error_msg % payload_data.hex())
                     raise PacketParseError  # noqa: TRY301
 
                 # Decrypt the payload packet
-                payload = await self.decryptSession(payload_data)
+                payload = self._session_cipher.decrypt_frame(payload_data)
                 self._logger.log_filtered(
                     LogOptions.DECRYPTED_PAYLOADS,
                     "parseEncPackets: decrypted payload: %r",
@@ -665,39 +719,110 @@ class Connection:
             except Exception as e:  # noqa: BLE001
                 await self.add_error(e)
 
+        if discarded := buffer.discarded_bytes - discarded_bytes:
+            error_msg = (
+                "parseEncPackets: Unable to parse encrypted packet - prefix is "
+                "incorrect, skipped %d bytes"
+            )
+            self._logger.error(error_msg, discarded)
+            self._last_errors.append(error_msg % discarded)
+
         return packets
 
-    async def sendRequest(self, send_data: bytes, response_handler=None):
+    async def _notificationHandler(
+        self, characteristic: BleakGATTCharacteristic, recv_data: bytearray
+    ):
+        handler = self._notification_handlers.get(self._state)
+        if handler is None:
+            self._logger.log_filtered(
+                LogOptions.CONNECTION_DEBUG,
+                "Dropping notification received in state %s: %r",
+                self._state,
+                bytearray(recv_data).hex(),
+            )
+            return
+
+        await handler(characteristic, recv_data)
+
+    async def sendRequest(
+        self,
+        send_data: bytes,
+        priority: WritePriority = WritePriority.COMMAND,
+        key: Hashable | None = None,
+    ):
+        """Queue data for writing and wait until it's written"""
+        if (written := await self._queueRequest(send_data, priority, key)) is not None:
+            await written
+
+    async def _queueRequest(
+        self,
+        send_data: bytes,
+        priority: WritePriority = WritePriority.COMMAND,
+        key: Hashable | None = None,
+    ) -> asyncio.Future[None] | None:
+        if self._writer_task is None or self._writer_task.done():
+            self._logger.log_filtered(
+                LogOptions.CONNECTION_DEBUG,
+                "Skip sending: writer is not running: %r",
+                bytearray(send_data).hex(),
+            )
+            return None
+
         self._logger.log_filtered(
-            LogOptions.CONNECTION_DEBUG, "Sending: %r", bytearray(send_data).hex()
+            LogOptions.CONNECTION_DEBUG, "Queueing: %r", bytearray(send_data).hex()
         )
-        # In case exception happens we need to try again
-        err = None
-        for retry in range(4):
+        return await self._write_queue.put(send_data, priority, key)
+
+    async def _writer(self):
+        """Write queued requests one by one, so writes never race each other"""
+        queue = self._write_queue
+        while True:
+            write = await queue.get()
+            self._logger.log_filtered(
+                LogOptions.CONNECTION_DEBUG, "Sending: %r", bytearray(write.data).hex()
+            )
             try:
-                await self._sendRequest(send_data, response_handler)
+                await self._sendRequest(write.data)
             except Exception as e:  # noqa: BLE001
-                self._logger.log_filtered(
-                    LogOptions.CONNECTION_DEBUG,
-                    (
-                        "Exception occured when sending request on try %d: %s, "
-                        "retrying in %d seconds"
-                    ),
-                    retry,
-                    str(e),
-                    retry + 1,
-                    level=logging.WARNING,
-                )
-                if err is None:
-                    err = e
-                await asyncio.sleep(retry + 1)
+                await self._writeFailed(write, e)
                 continue
-            else:
-                return
 
-        await self.add_error(err)
+            queue.record_latency(write.queued_at)
+            if not write.done.done():
+                write.done.set_result(None)
+
+    async def _writeFailed(self, write: QueuedWrite, exc: Exception):
+        if write.priority is WritePriority.REPLY:
+            # Device sends the next message soon, its reply replaces this one
+            self._logger.log_filtered(
+                LogOptions.CONNECTION_DEBUG,
+                "Dropping reply that failed to send: %s",
+                str(exc),
+            )
+            self._write_queue.drop(write)
+            return
+
+        if write.attempt >= WRITE_RETRIES:
+            self._write_queue.drop(write)
+            await self.add_error(exc)
+            return
+
+        # Retried write waits in the queue, so writes queued after it are not blocked
+        delay = write.attempt + 1
+        self._logger.log_filtered(
+            LogOptions.CONNECTION_DEBUG,
+            (
+                "Exception occured when sending request on try %d: %s, "
+                "retrying in %d seconds"
+            ),
+            write.attempt,
+            str(exc),
+            delay,
+            level=logging.WARNING,
+        )
+        self._write_queue.retry(write, delay)
 
-    async def _sendRequest(self, send_data: bytes, response_handler=None):
+    async def _sendRequest(self, send_data: bytes):
         # Make sure the connection is here, otherwise just skipping
         if self._client is None or not self._client.is_connected:
             self._logger.log_filtered(
@@ -707,31 +832,85 @@ class Connection:
             )
             return
 
-        if response_handler:
-            await self._client.start_notify(
-                Connection.NOTIFY_CHARACTERISTIC, response_handler
-            )
         await self._client.write_gatt_char(
             Connection.WRITE_CHARACTERISTIC, bytearray(send_data)
         )
 
-    async def sendPacket(self, packet: Packet, response_handler=None):
+    async def sendPacket(
+        self, packet: Packet, priority: WritePriority = WritePriority.COMMAND
+    ):
         self._logger.log_filtered(
             LogOptions.CONNECTION_DEBUG, "Sending packet: %r", packet
         )
+        await self.sendRequest(self._encryptPacket(packet), priority)
+
+    async def sendConfirmedPacket(
+        self,
+        packet: Packet,
+        timeout: float = COMMAND_TIMEOUT,
+        confirmed: asyncio.Future[Packet | None] | None = None,
+    ) -> Packet | None:
+        """
+        Send packet with a new sequence number and wait for the device to confirm it
+
+        Parameters
+        ----------
+        packet
+            Packet to send, its sequence number is replaced
+        timeout
+            Seconds to wait for confirmation
+        confirmed
+            Future that could be resolved by the caller when it sees the device
+            confirming the packet in some other way, e.g. by reporting changed state
+
+        Return
+        -------
+        Response packet with the same command set and sequence number, or result of
+        `confirmed` if it was resolved first
+
+        Raises
+        ------
+        TimeoutError
+            Device didn't confirm the packet within timeout
+        """
+        packet.seq = self._nextSeq()
+        if confirmed is None:
+            confirmed = asyncio.get_running_loop().create_future()
+
+        key = (packet.cmdSet, packet.seq)
+        self._pending_responses[key] = confirmed
+        try:
+            # Time spent in the write queue counts towards the timeout, but not towards
+            # the round trip of the command
+            async with asyncio.timeout(timeout):
+                await self.sendPacket(packet)
+                sent_at = time.monotonic()
+                response = await asyncio.shield(confirmed)
+        except TimeoutError:
+            self._commands_timed_out += 1
+            raise
+        finally:
+            self._pending_responses.pop(key, None)
+
+        self._command_round_trips.append(time.monotonic() - sent_at)
+        return response
+
+    def _nextSeq(self) -> bytes:
+        # First byte is kept at zero, devices that xor payloads use it as the xor key
+        self._seq = (self._seq + 1) & 0xFFFFFF
+        return b"\x00" + self._seq.to_bytes(3, "little")
+
+    def _encryptPacket(self, packet: Packet) -> bytes:
         # Wrapping and encrypting with session key
-        to_send = EncPacket(
+        return EncPacket(
             EncPacket.FRAME_TYPE_PROTOCOL,
             EncPacket.PAYLOAD_TYPE_VX_PROTOCOL,
             packet.toBytes(),
             0,
             0,
-            self._session_key,
-            self._iv,
+            self._session_cipher,
         ).toBytes()
 
-        await self.sendRequest(to_send, response_handler)
-
     async def replyPacket(self, packet: Packet):
         """Copy and change the packet to be reply packet and sends it back to device"""
         # Found it's necesary to send back the packets, otherwise device will not send
@@ -749,27 +928,34 @@ class Connection:
             packet.seq,
             packet.productId,
         )
-        # Running reply asynchroneously
-        self._add_task(self.sendPacket(reply_packet))
+        self._logger.log_filtered(
+            LogOptions.CONNECTION_DEBUG, "Sending reply: %r", reply_packet
+        )
+        # Not waiting for the write, replies are sent after all queued commands. Reply
+        # to the same message that is still queued is replaced with this one
+        await self._queueRequest(
+            self._encryptPacket(reply_packet),
+            WritePriority.REPLY,
+            key=(packet.src, packet.cmdSet, packet.cmdId),
+        )
 
     async def initBleSessionKey(self):
         self._set_state(ConnectionState.PUBLIC_KEY_EXCHANGE)
         self._logger.log_filtered(
             LogOptions.CONNECTION_DEBUG, "initBleSessionKey: Pub key exchange"
         )
-        self._private_key = ecdsa.SigningKey.generate(curve=ecdsa.SECP160r1)
-        self._public_key = self._private_key.get_verifying_key()
+        self._key_pair = await ecdh.key_pair_pool.acquire()
 
         to_send = EncPacket(
             EncPacket.FRAME_TYPE_COMMAND,
             EncPacket.PAYLOAD_TYPE_VX_PROTOCOL,
             # Payload contains some weird prefix and generated public key
-            b"\x01\x00" + self._public_key.to_string(),
+            b"\x01\x00" + self._key_pair.public_key,
         ).toBytes()
 
         # Device public key is sent as response, process will continue on device
         # response in handler
-        await self.sendRequest(to_send, self.initBleSessionKeyHandler)
+        await self.sendRequest(to_send)
 
     async def initBleSessionKeyHandler(
         self, characteristic: BleakGATTCharacteristic, recv_data: bytearray
@@ -778,7 +964,6 @@ class Connection:
             return
 
         self._set_state(ConnectionState.PUBLIC_KEY_RECEIVED)
-        await self._client.stop_notify(Connection.NOTIFY_CHARACTERISTIC)
 
         data = await self.parseSimple(bytes(recv_data))
         if len(data) < 3:
@@ -787,17 +972,15 @@ class Connection:
             )
         # status = data[1]
         ecdh_type_size = getEcdhTypeSize(data[2])
-        self._dev_pub_key = ecdsa.VerifyingKey.from_string(
-            data[3 : ecdh_type_size + 3], curve=ecdsa.SECP160r1
-        )
+        dev_pub_key = data[3 : ecdh_type_size + 3]
 
         # Generating shared key from our private key and received device public key
         # NOTE: The device will do the same with it's private key and our public key to
         # generate the # same shared key value and use it to encrypt/decrypt using
         # symmetric encryption algorithm
-        self._shared_key = ecdsa.ECDH(
-            ecdsa.SECP160r1, self._private_key, self._dev_pub_key
-        ).generate_sharedsecret_bytes()
+        self._shared_key = await asyncio.get_running_loop().run_in_executor(
+            None, self._key_pair.shared_secret, dev_pub_key
+        )
         # Set Initialization Vector from digest of the original shared key
         self._iv = hashlib.md5(self._shared_key).digest()
         if len(self._shared_key) > 16:
@@ -817,7 +1000,8 @@ class Connection:
             b"\x02",  # command to get key info to make the shared key
         ).toBytes()
 
-        await self.sendRequest(to_send, self.getKeyInfoReqHandler)
+        self._request_sent_at = time.monotonic()
+        await self.sendRequest(to_send)
 
     async def getKeyInfoReqHandler(
         self, characteristic: BleakGATTCharacteristic, recv_data: bytearray
@@ -826,7 +1010,7 @@ class Connection:
             return
 
         self._set_state(ConnectionState.SESSION_KEY_RECEIVED)
-        await self._client.stop_notify(Connection.NOTIFY_CHARACTERISTIC)
+        self._session_key_round_trip = time.monotonic() - self._request_sent_at
         encrypted_data = await self.parseSimple(bytes(recv_data))
 
         if encrypted_data[0] != 0x02:
@@ -836,22 +1020,32 @@ class Connection:
             )
 
         # Skipping the first byte - type of the payload (0x02)
-        data = await self.decryptShared(encrypted_data[1:])
+        data = SessionCipher(self._shared_key, self._iv).decrypt_frame(
+            encrypted_data[1:]
+        )
 
         # Parse the data that contains sRand (first 16 bytes) & seed (last 2 bytes)
         self._session_key = await self.genSessionKey(data[16:18], data[:16])
+        # Cipher is reused for every frame of the session
+        self._session_cipher = SessionCipher(self._session_key, self._iv)
 
         await self.getAuthStatus()
 
     async def getAuthStatus(self):
+        if self._fast_handshake:
+            # Auth status response is not used for authentication, so fast handshake
+            # sends both requests together from autoAuthentication
+            await self.autoAuthentication()
+            return
+
         self._set_state(ConnectionState.REQUESTING_AUTH_STATUS)
         self._logger.log_filtered(
             LogOptions.CONNECTION_DEBUG, "getKeyInfoReq: Receiving auth status"
         )
+        await self.sendPacket(self._authStatusPacket())
 
-        packet = Packet(0x21, 0x35, 0x35, 0x89, b"", 0x01, 0x01, self._packet_version)
-
-        await self.sendPacket(packet, self.getAuthStatusHandler)
+    def _authStatusPacket(self):
+        return Packet(0x21, 0x35, 0x35, 0x89, b"", 0x01, 0x01, self._packet_version)
 
     async def getAuthStatusHandler(
         self, characteristic: BleakGATTCharacteristic, recv_data: bytearray
@@ -859,11 +1053,15 @@ class Connection:
         if self._client is None or not self._client.is_connected:
             return
 
-        self._set_state(ConnectionState.AUTH_STATUS_RECEIVED)
-        await self._client.stop_notify(Connection.NOTIFY_CHARACTERISTIC)
         packets = await self.parseEncPackets(bytes(recv_data))
         if len(packets) < 1:
+            if len(self._enc_packet_buffer):
+                # Response is split between notifications, staying in the current
+                # state routes the rest of it here as well
+                return
             raise PacketReceiveError
+
+        self._set_state(ConnectionState.AUTH_STATUS_RECEIVED)
         data = packets[0].payload
 
         self._logger.log_filtered(
@@ -890,8 +1088,22 @@ class Connection:
             0x21, 0x35, 0x35, 0x86, payload, 0x01, 0x01, self._packet_version
         )
 
-        # Sending request and starting the common listener
-        await self.sendPacket(packet, self.listenForDataHandler)
+        if self._fast_handshake:
+            if self._skip_auth_status:
+                # Skipping the whole round trip, session key request is the closest
+                # estimate of how long it would take
+                self._handshake_time_saved = self._session_key_round_trip
+            else:
+                # Response is handled by the common listener
+                self._logger.log_filtered(
+                    LogOptions.CONNECTION_DEBUG,
+                    "autoAuthentication: Requesting auth status without waiting",
+                )
+                await self.sendPacket(self._authStatusPacket())
+
+        # Sending request, response is handled by the common listener
+        self._request_sent_at = time.monotonic()
+        await self.sendPacket(packet)
 
     async def listenForDataHandler(
         self, characteristic: BleakGATTCharacteristic, recv_data: bytearray
@@ -927,7 +1139,38 @@ class Connection:
                 self._logger.info("Auth completed, everything is fine")
                 self._set_state(ConnectionState.AUTHENTICATED)
                 self._connected.set()
+            elif packet.src == 0x35 and packet.cmdSet == 0x35 and packet.cmdId == 0x89:
+                # Auth status response when it was not waited for by fast handshake,
+                # authentication would be sent only now without it
+                processed = True
+                self._handshake_time_saved = max(
+                    time.monotonic() - self._request_sent_at, 0
+                )
+                self._logger.log_filtered(
+                    LogOptions.CONNECTION_DEBUG,
+                    "listenForDataHandler: auth status: %r",
+                    bytearray(packet.payload).hex(),
+                )
             else:
+                if (
+                    self._pending_responses
+                    and (
+                        confirmed := self._pending_responses.pop(
+                            (packet.cmdSet, packet.seq), None
+                        )
+                    )
+                    is not None
+                ):
+                    if not confirmed.done():
+                        confirmed.set_result(packet)
+                    self._logger.log_filtered(
+                        LogOptions.CONNECTION_DEBUG,
+                        "listenForDataHandler: response: %r",
+                        packet,
+                    )
+
+                # Device reports could share the sequence number with a response, so
+                # responses are parsed as well, devices only process their reports
                 try:
                     # Processing the packet with specific device
                     processed = await self._data_parse(packet)
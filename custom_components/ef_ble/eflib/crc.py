@@ -1,20 +1,100 @@
-"""Utils for simple use of crc"""
+"""
+Table-driven CRC8/CRC16 used by the packet framing
 
-from crc import Calculator, Configuration, Crc8
+Both checksums are computed with a precomputed 256-entry lookup table, so checksumming
+a frame is a single pass over the data without allocating anything. `bytes`,
+`bytearray` and `memoryview` are accepted as is, so slices of a received buffer can be
+checksummed through a `memoryview` without copying them first.
 
-crc16_arc = Configuration(
-    width=16,
-    polynomial=0x8005,
-    init_value=0x0000,
-    final_xor_value=0x0000,
-    reverse_input=True,
-    reverse_output=True,
-)
+For checksumming data that is not contiguous (e.g. header and payload kept in separate
+buffers), use `Crc8`/`Crc16` objects and feed the parts with `update()`:
 
+>>> crc = Crc16(header).update(payload).digest()
+"""
 
-def crc8(data: str):
-    return Calculator(Crc8.CCITT).checksum(data)
+from typing import Self
 
+type Buffer = bytes | bytearray | memoryview
 
-def crc16(data: str):
-    return Calculator(crc16_arc).checksum(data)
+
+def _crc8_table(polynomial: int) -> tuple[int, ...]:
+    table = []
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            crc = ((crc << 1) ^ polynomial) & 0xFF if crc & 0x80 else (crc << 1) & 0xFF
+        table.append(crc)
+    return tuple(table)
+
+
+def _crc16_reflected_table(polynomial: int) -> tuple[int, ...]:
+    table = []
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            crc = (crc >> 1) ^ polynomial if crc & 0x01 else crc >> 1
+        table.append(crc)
+    return tuple(table)
+
+
+# CRC-8/CCITT: poly 0x07, init 0x00, no reflection, no final xor
+_CRC8_TABLE = _crc8_table(0x07)
+# CRC-16/ARC: poly 0x8005 (0xA001 reflected), init 0x0000, reflected in/out, no final
+# xor
+_CRC16_TABLE = _crc16_reflected_table(0xA001)
+
+
+class Crc8:
+    """Incremental CRC-8/CCITT calculator"""
+
+    __slots__ = ("_crc",)
+
+    def __init__(self, data: Buffer = b"") -> None:
+        self._crc = 0
+        if data:
+            self.update(data)
+
+    def update(self, data: Buffer) -> Self:
+        """Feed more data into the checksum"""
+        crc = self._crc
+        table = _CRC8_TABLE
+        for byte in data:
+            crc = table[crc ^ byte]
+        self._crc = crc
+        return self
+
+    def digest(self) -> int:
+        """Return checksum of all data fed so far"""
+        return self._crc
+
+
+class Crc16:
+    """Incremental CRC-16/ARC calculator"""
+
+    __slots__ = ("_crc",)
+
+    def __init__(self, data: Buffer = b"") -> None:
+        self._crc = 0
+        if data:
+            self.update(data)
+
+    def update(self, data: Buffer) -> Self:
+        """Feed more data into the checksum"""
+        crc = self._crc
+        table = _CRC16_TABLE
+        for byte in data:
+            crc = (crc >> 8) ^ table[(crc ^ byte) & 0xFF]
+        self._crc = crc
+        return self
+
+    def digest(self) -> int:
+        """Return checksum of all data fed so far"""
+        return self._crc
+
+
+def crc8(data: Buffer) -> int:
+    return Crc8(data).digest()
+
+
+def crc16(data: Buffer) -> int:
+    return Crc16(data).digest()
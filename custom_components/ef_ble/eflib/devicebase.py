@@ -1,15 +1,20 @@
 import abc
 import asyncio
-import time
+import contextlib
 from collections import defaultdict
-from collections.abc import Callable, MutableSequence
+from collections.abc import AsyncIterator, Awaitable, Callable, MutableSequence
+from contextvars import ContextVar
+from dataclasses import dataclass
 from typing import Any
 
 from bleak.backends.device import BLEDevice
 from bleak.backends.scanner import AdvertisementData
 from bleak_retry_connector import MAX_CONNECT_ATTEMPTS
+from google.protobuf.message import DecodeError, Message
 
+from .coalescing import CoalescingWriter
 from .connection import (
+    COMMAND_TIMEOUT,
     Connection,
     ConnectionState,
     ConnectionStateListener,
@@ -25,12 +30,51 @@ from .logging_util import (
     LogOptions,
 )
 from .packet import Packet
+from .payloadcache import PayloadCache
+from .props.updatable_props import Field
+from .updatethrottle import UpdateThrottle
+
+type ConfigSender = Callable[[Message, dict[str, Any] | None], Awaitable[bool]]
+
+
+class ConfigBatch:
+    """Config writes collected by `DeviceBase.batch()` to be sent as one message"""
+
+    def __init__(self) -> None:
+        self.message: Message | None = None
+        self.expected: dict[str, Any] = {}
+        self.send: ConfigSender | None = None
+        # Result of sending the merged message, None until batch is sent
+        self.confirmed: bool | None = None
+        # Tasks started inside the batch keep seeing it after it is done
+        self.closed = False
+
+    def add(
+        self,
+        send: ConfigSender,
+        message: Message,
+        expected: dict[str, Any] | None = None,
+    ):
+        if self.message is None:
+            self.message = type(message)()
+            self.send = send
+        self.message.MergeFrom(message)
+        if expected:
+            self.expected |= expected
+
+
+@dataclass
+class _OptimisticValue:
+    value: Any
 
 
 class DeviceBase(abc.ABC):
     """Device Base"""
 
     MANUFACTURER_KEY = 0xB5B5
+    # Whether device has to be asked for auth status before authentication, fast
+    # handshake skips the request completely for devices that don't need it
+    AUTH_STATUS_REQUIRED = True
 
     @classmethod
     @abc.abstractmethod
@@ -63,11 +107,22 @@ class DeviceBase(abc.ABC):
         self._state_update_callbacks: dict[str, set[Callable[[Any], None]]] = (
             defaultdict(set)
         )
-        self._update_period = 0
-        self._last_updated = 0
-        self._props_to_update = set()
-        self._wait_until_throttle = 0
+        self._update_throttle = UpdateThrottle(self._run_callbacks)
+        # Last payloads decoded into fields, by message type
+        self._payload_cache = PayloadCache()
         self._packet_version = 0x03
+        self._fast_handshake = False
+        # Field values expected to be reported by device for commands waiting for
+        # confirmation
+        self._expected_states: list[
+            tuple[dict[str, Any], asyncio.Future[Packet | None]]
+        ] = []
+        self._config_batch: ContextVar[ConfigBatch | None] = ContextVar(
+            "config_batch", default=None
+        )
+        self._coalescing_writers: dict[str, CoalescingWriter] = {}
+        # Values shown before the device confirmed them, by property name
+        self._optimistic_values: dict[str, _OptimisticValue] = {}
 
         self._reconnect_disabled = False
         self._diagnostics = DeviceDiagnosticsCollector(self)
@@ -113,12 +168,40 @@ class DeviceBase(abc.ABC):
     def connection_state(self):
         return None if self._conn is None else self._conn._connection_state
 
+    @property
+    def coalescing_stats(self):
+        return {
+            prop: writer.stats() for prop, writer in self._coalescing_writers.items()
+        }
+
+    def coalescing_writer(self, propname: str, delay: float = 0.3):
+        """Get writer that debounces writes of property, shared by its entities"""
+        if (writer := self._coalescing_writers.get(propname)) is None:
+            writer = self._coalescing_writers[propname] = CoalescingWriter(delay)
+        return writer
+
+    @property
+    def command_stats(self):
+        return None if self._conn is None else self._conn.command_stats
+
+    @property
+    def write_queue_stats(self):
+        return None if self._conn is None else self._conn.write_queue_stats
+
+    @property
+    def update_stats(self):
+        return self._update_throttle.stats()
+
+    @property
+    def payload_cache_stats(self):
+        return self._payload_cache.stats()
+
     @property
     def diagnostics(self):
         return self._diagnostics
 
     def with_update_period(self, period: int):
-        self._update_period = period
+        self._update_throttle.period = period
         return self
 
     def with_logging_options(self, options: LogOptions):
@@ -139,6 +222,14 @@ class DeviceBase(abc.ABC):
         )
         return self
 
+    def with_fast_handshake(self, enabled: bool = True):
+        self._fast_handshake = enabled
+        if self._conn is not None:
+            self._conn.with_fast_handshake(
+                enabled, skip_auth_status=not self.AUTH_STATUS_REQUIRED
+            )
+        return self
+
     def with_enabled_packet_diagnostics(self, enabled: bool = True):
         self._diagnostics.enabled(enabled)
         return self
@@ -181,6 +272,10 @@ class DeviceBase(abc.ABC):
                 )
                 .with_logging_options(self._logger.options)
                 .with_disabled_reconnect(self._reconnect_disabled)
+                .with_fast_handshake(
+                    self._fast_handshake,
+                    skip_auth_status=not self.AUTH_STATUS_REQUIRED,
+                )
             )
             self._connection_event.set()
 
@@ -189,12 +284,168 @@ class DeviceBase(abc.ABC):
             self._conn.on_disconnect(self._on_disconnect)
             self._conn.on_packet_data_received(self._on_packet_received)
             self._conn.on_state_change(self._on_connection_state_change)
+            self._conn.on_state_change(self._log_connection_state)
+            self._conn.on_state_change(self._invalidate_payload_cache)
+            self._conn.on_state_change(self._cancel_coalesced_writes)
 
         elif self._conn._user_id != user_id:
             self._conn._user_id = user_id
 
         await self._conn.connect(max_attempts=max_attempts, timeout=timeout)
 
+    def _log_connection_state(self, state: ConnectionState):
+        reason = None
+        if (
+            state is ConnectionState.AUTHENTICATED
+            and self._conn is not None
+            and (time_saved := self._conn.handshake_time_saved) is not None
+        ):
+            reason = f"Fast handshake saved {time_saved * 1000:.0f} ms"
+
+        self.connection_log.append(state, reason)
+
+    def _invalidate_payload_cache(self, state: ConnectionState):
+        # Reports received after reconnecting are always decoded in full, so fields are
+        # refreshed even if the device resends what it sent before disconnecting
+        if state is ConnectionState.AUTHENTICATED:
+            self._payload_cache.invalidate()
+
+    def _cancel_coalesced_writes(self, state: ConnectionState):
+        # Debounced writes would otherwise be sent to the device after it reconnects,
+        # long after their callers gave up on them
+        if state.is_error or state in (
+            ConnectionState.RECONNECTING,
+            ConnectionState.DISCONNECTING,
+            ConnectionState.DISCONNECTED,
+        ):
+            for writer in self._coalescing_writers.values():
+                writer.cancel()
+
+    @contextlib.asynccontextmanager
+    async def batch(self) -> AsyncIterator[ConfigBatch]:
+        """
+        Merge config writes of all setters called inside into a single packet
+
+        Setters still validate their values, but return True right after the value is
+        added to the batch. The merged message is sent when the context exits without
+        an exception, result of its confirmation is stored in `ConfigBatch.confirmed`.
+        Nested batches are merged into the outermost one. Only setters awaited inside
+        the block join the batch, writes running concurrently in other tasks are sent
+        on their own.
+
+        Example
+        -------
+        ```
+        async with device.batch() as batch:
+            await device.set_battery_charge_limit_min(10)
+            await device.set_battery_charge_limit_max(90)
+        ```
+        """
+        if (batch := self._config_batch.get()) is not None and not batch.closed:
+            yield batch
+            return
+
+        batch = ConfigBatch()
+        token = self._config_batch.set(batch)
+        try:
+            yield batch
+        finally:
+            batch.closed = True
+            self._config_batch.reset(token)
+
+        if batch.message is not None and batch.send is not None:
+            batch.confirmed = await batch.send(batch.message, batch.expected or None)
+
+    def _add_to_batch(
+        self,
+        send: ConfigSender,
+        message: Message,
+        expected: dict[str, Any] | None = None,
+    ) -> bool:
+        """
+        Add config write to the current batch
+
+        Parameters
+        ----------
+        send
+            Function that sends the merged message when the batch is done
+        message
+            Config write message to merge into the batch
+        expected
+            Field values that confirm the write
+
+        Return
+        -------
+        False if there is no batch and message has to be sent right away
+        """
+        if (batch := self._config_batch.get()) is None or batch.closed:
+            return False
+
+        batch.add(send, message, expected)
+        return True
+
+    async def _send_confirmed_packet(
+        self,
+        packet: Packet,
+        ack_type: type[Message] | None = None,
+        expected: dict[str, Any] | None = None,
+        timeout: float = COMMAND_TIMEOUT,
+    ) -> bool:
+        """
+        Send packet and wait until device confirms it
+
+        Parameters
+        ----------
+        packet
+            Packet to send
+        ack_type
+            Protobuf message the device responds with, if it has `config_ok` field set
+            to false the command is considered rejected
+        expected
+            Field values that confirm the command when reported by the device, for
+            devices that don't respond to it
+        timeout
+            Seconds to wait for confirmation
+
+        Return
+        -------
+        True if device confirmed the command, False if it was rejected or not
+        confirmed within timeout
+        """
+        if self._conn is None:
+            return False
+
+        confirmed = None
+        if expected:
+            confirmed = asyncio.get_running_loop().create_future()
+            if all(getattr(self, name, None) == v for name, v in expected.items()):
+                # Device already reports these values, so it won't report any change
+                confirmed.set_result(None)
+            self._expected_states.append((expected, confirmed))
+
+        try:
+            response = await self._conn.sendConfirmedPacket(packet, timeout, confirmed)
+        except TimeoutError:
+            self._logger.warning("Command was not confirmed by device: %r", packet)
+            return False
+        finally:
+            if confirmed is not None:
+                self._expected_states.remove((expected, confirmed))
+
+        if response is None or ack_type is None:
+            return True
+
+        try:
+            ack = ack_type.FromString(response.payload)
+        except DecodeError:
+            self._logger.debug("Unexpected command response: %r", response)
+            return True
+
+        if ack.HasField("config_ok") and not ack.config_ok:
+            self._logger.warning("Command was rejected by device: %r", packet)
+            return False
+        return True
+
     async def disconnect(self):
         if self._conn is None:
             self._logger.error("Device has no connection")
@@ -292,31 +543,14 @@ class DeviceBase(abc.ABC):
             self._callbacks_map.get(propname, set()).discard(callback)
 
     def update_callback(self, propname: str) -> None:
-        """Find the registered callbacks in the map and then calling the callbacks"""
-
-        self._props_to_update.add(propname)
+        """Schedule registered callbacks of property to be called on the next flush"""
+        self._update_throttle.mark(propname)
 
-        if self._update_period != 0:
-            now = time.time()
-            if now - self._last_updated < self._update_period:
-                if self._wait_until_throttle is None:
-                    return
-
-                # let first few messages update as soon as they come, otherwise
-                # everything would display unknown until first period ends
-                if self._wait_until_throttle == 0:
-                    self._wait_until_throttle = now + 5
-                elif self._wait_until_throttle < now:
-                    self._wait_until_throttle = None
-
-            self._last_updated = now
-
-        for prop in self._props_to_update:
+    def _run_callbacks(self, propnames: set[str]):
+        for prop in propnames:
             for callback in self._callbacks_map.get(prop, set()):
                 callback()
 
-        self._props_to_update.clear()
-
     def register_state_update_callback(
         self, state_update_callback: Callable[[Any], None], propname: str
     ):
@@ -331,8 +565,105 @@ class DeviceBase(abc.ABC):
 
     def update_state(self, propname: str, value: Any):
         """Run callback for updated state"""
+        for expected, confirmed in self._expected_states:
+            if (
+                not confirmed.done()
+                and propname in expected
+                and all(getattr(self, name, None) == v for name, v in expected.items())
+            ):
+                confirmed.set_result(None)
+
+        if (optimistic := self._optimistic_values.get(propname)) is not None:
+            if value != optimistic.value:
+                # Report was most probably sent before the device applied the write,
+                # it's resolved after the write is confirmed or rejected
+                return
+            del self._optimistic_values[propname]
+
+        self._publish_state(propname, value)
+
+    def _publish_state(self, propname: str, value: Any):
         if propname not in self._state_update_callbacks:
             return
 
         for update in self._state_update_callbacks[propname]:
             update(value)
+
+    async def write_optimistic[T](
+        self, propname: str, value: Any, write: Awaitable[T]
+    ) -> T:
+        """
+        Show new value of a property right away and send it to the device
+
+        The value is published to state update callbacks before the write is sent,
+        while the property itself keeps the last value reported by the device, so the
+        report that applies the write is still detected as an update. Device reports
+        with a different value are held back until the write is done, as they were
+        most probably sent before the device applied it. If the write fails, the last
+        value reported by the device is published again.
+
+        Setters that only send the write without waiting for confirmation return None.
+        Their value is kept until the device reports it, or until `COMMAND_TIMEOUT`
+        passes, after which the last reported value is published again.
+
+        Parameters
+        ----------
+        propname
+            Name of the field that is changed by the write
+        value
+            Value the field will have after the write
+        write
+            Setter call that sends the value, returning True means the device confirmed
+            it, None that it was only sent and anything else that it failed
+
+        Return
+        -------
+        Result of the write
+        """
+        if not isinstance(getattr(type(self), propname, None), Field):
+            return await write
+
+        optimistic = self._optimistic_values[propname] = _OptimisticValue(value)
+        self._publish_state(propname, value)
+
+        confirmed = False
+        try:
+            confirmed = await write
+        finally:
+            # Newer write of the same property takes over its reconciliation
+            if self._optimistic_values.get(propname) is optimistic:
+                self._reconcile(propname, optimistic, confirmed)
+        return confirmed
+
+    def _reconcile(self, propname: str, optimistic: _OptimisticValue, confirmed: Any):
+        if confirmed is None and getattr(self, propname, None) != optimistic.value:
+            # Write was only sent, the report of its value is the only confirmation
+            asyncio.get_running_loop().call_later(
+                COMMAND_TIMEOUT, self._expire_optimistic, propname, optimistic
+            )
+            return
+
+        del self._optimistic_values[propname]
+        if confirmed is True or confirmed is None:
+            # Any report held back was older than the confirmation, next report with
+            # the written value updates the property
+            return
+
+        self._roll_back(propname, optimistic)
+
+    def _expire_optimistic(self, propname: str, optimistic: _OptimisticValue):
+        if self._optimistic_values.get(propname) is not optimistic:
+            return
+
+        del self._optimistic_values[propname]
+        self._roll_back(propname, optimistic)
+
+    def _roll_back(self, propname: str, optimistic: _OptimisticValue):
+        reported = getattr(self, propname, None)
+        self._logger.warning(
+            "Write of %s=%r was not confirmed, rolling back to %r",
+            propname,
+            optimistic.value,
+            reported,
+        )
+        self._publish_state(propname, reported)
@@ -1,5 +1,6 @@
 import logging
 from math import floor
+from typing import Any
 
 from bleak.backends.device import BLEDevice
 from bleak.backends.scanner import AdvertisementData
@@ -10,6 +11,7 @@ from ..packet import Packet
 from ..pb import dc009_apl_comm_pb2
 from ..props import Field, ProtobufProps, pb_field, proto_attr_mapper
 from ..props.enums import IntFieldValue
+from ..props.utils import to_float32
 
 pb = proto_attr_mapper(dc009_apl_comm_pb2.DisplayPropertyUpload)
 
@@ -123,29 +125,40 @@ class Device(DeviceBase, ProtobufProps):
 
         return processed
 
-    async def _send_config_packet(self, message: dc009_apl_comm_pb2.ConfigWrite):
+    async def _send_config_packet(
+        self,
+        message: dc009_apl_comm_pb2.ConfigWrite,
+        expected: dict[str, Any] | None = None,
+    ):
+        if self._add_to_batch(self._send_config_packet, message, expected):
+            return True
+
         payload = message.SerializeToString()
         packet = Packet(0x20, 0x14, 0xFE, 0x11, payload, 0x01, 0x01, 0x13)
-        await self._conn.sendPacket(packet)
+        return await self._send_confirmed_packet(
+            packet, dc009_apl_comm_pb2.ConfigWriteAck, expected
+        )
 
     async def enable_charger_open(self, enable: bool):
-        await self._send_config_packet(
-            dc009_apl_comm_pb2.ConfigWrite(cfg_sp_charger_chg_open=enable)
+        return await self._send_config_packet(
+            dc009_apl_comm_pb2.ConfigWrite(cfg_sp_charger_chg_open=enable),
+            expected={"charger_open": enable},
         )
 
     async def set_charger_mode(self, mode: ChargerMode):
-        await self._send_config_packet(
-            dc009_apl_comm_pb2.ConfigWrite(cfg_sp_charger_chg_mode=mode.as_pb_enum())
+        return await self._send_config_packet(
+            dc009_apl_comm_pb2.ConfigWrite(cfg_sp_charger_chg_mode=mode.as_pb_enum()),
+            expected={"charger_mode": mode},
         )
 
     async def set_power_limit(self, limit: int):
         if self.power_max is None or limit < 0 or limit > self.power_max:
             return False
 
-        await self._send_config_packet(
-            dc009_apl_comm_pb2.ConfigWrite(cfg_sp_charger_chg_pow_limit=limit)
+        return await self._send_config_packet(
+            dc009_apl_comm_pb2.ConfigWrite(cfg_sp_charger_chg_pow_limit=limit),
+            expected={"power_limit": limit},
         )
-        return True
 
     async def set_battery_voltage(self, value: float):
         if (
@@ -155,12 +168,11 @@ class Device(DeviceBase, ProtobufProps):
         ):
             return False
 
-        await self._send_config_packet(
-            dc009_apl_comm_pb2.ConfigWrite(
-                cfg_sp_charger_car_batt_vol_setting=floor(value * 10)
-            )
+        setting = floor(value * 10)
+        return await self._send_config_packet(
+            dc009_apl_comm_pb2.ConfigWrite(cfg_sp_charger_car_batt_vol_setting=setting),
+            expected={"start_voltage": round(setting / 10, 1)},
         )
-        return True
 
     async def set_car_battery_curent_charge_limit(self, value: float):
         if (
@@ -168,16 +180,16 @@ class Device(DeviceBase, ProtobufProps):
             or 0 > value > self.reverse_charging_current_max
         ):
             return False
-        await self._send_config_packet(
-            dc009_apl_comm_pb2.ConfigWrite(cfg_sp_charger_car_batt_chg_amp_limit=value)
+        return await self._send_config_packet(
+            dc009_apl_comm_pb2.ConfigWrite(cfg_sp_charger_car_batt_chg_amp_limit=value),
+            expected={"reverse_charging_current_limit": to_float32(value)},
         )
-        return True
 
     async def set_device_battery_current_charge_limit(self, value: float):
         if self.charging_current_max is None or 0 > value > self.charging_current_max:
             return False
 
-        await self._send_config_packet(
-            dc009_apl_comm_pb2.ConfigWrite(cfg_sp_charger_dev_batt_chg_amp_limit=value)
+        return await self._send_config_packet(
+            dc009_apl_comm_pb2.ConfigWrite(cfg_sp_charger_dev_batt_chg_amp_limit=value),
+            expected={"charging_current_limit": to_float32(value)},
         )
-        return True
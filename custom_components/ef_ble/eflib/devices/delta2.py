@@ -107,26 +107,32 @@ class Device(DeviceBase, RawDataProps):
 
         match packet.src, packet.cmdSet, packet.cmdId:
             case 0x02, 0x20, 0x02:
-                self.update_from_bytes(Mr330PdHeart, packet.payload)
+                self.update_fields_from_bytes(Mr330PdHeart, packet.payload)
                 processed = True
             case 0x03, 0x03, 0x0E:
                 detail = self.update_from_bytes(AllKitDetailData, packet.payload)
                 self._update_product_type(detail)
                 processed = True
             case 0x03, 0x20, 0x02:
-                self.update_from_bytes(DirectEmsDeltaHeartbeatPack, packet.payload)
+                self.update_fields_from_bytes(
+                    DirectEmsDeltaHeartbeatPack, packet.payload
+                )
                 processed = True
             case 0x03, 0x20, 0x32:
-                self.update_from_bytes(DirectBmsMDeltaHeartbeatPack, packet.payload)
+                self.update_fields_from_bytes(
+                    DirectBmsMDeltaHeartbeatPack, packet.payload
+                )
                 processed = True
             case 0x06, 0x20, 0x32:
-                self.update_from_bytes(_BmsHeartbeatBattery1, packet.payload)
+                self.update_fields_from_bytes(_BmsHeartbeatBattery1, packet.payload)
                 processed = True
             case 0x04, _, 0x02:
-                self.update_from_bytes(DirectInvDelta2HeartbeatPack, packet.payload)
+                self.update_fields_from_bytes(
+                    DirectInvDelta2HeartbeatPack, packet.payload
+                )
                 processed = True
             case 0x05, 0x20, 0x02:
-                self.update_from_bytes(Mr330MpptHeart, packet.payload)
+                self.update_fields_from_bytes(Mr330MpptHeart, packet.payload)
                 processed = True
 
         if processed:
@@ -28,19 +28,28 @@ class Device(delta3_classic.Device):
     )
 
     async def enable_usb_ports(self, enabled: bool):
-        await self._send_config_packet(pd335_sys_pb2.ConfigWrite(cfg_usb_open=enabled))
+        return await self._send_config_packet(
+            pd335_sys_pb2.ConfigWrite(cfg_usb_open=enabled),
+            expected={"usb_ports": enabled},
+        )
 
     async def enable_energy_strategy_self_powered(self, enabled: bool):
         config = pd335_sys_pb2.ConfigWrite()
         config.cfg_energy_strategy_operate_mode.operate_self_powered_open = enabled
-        await self._send_config_packet(config)
+        return await self._send_config_packet(
+            config, expected={"energy_strategy_self_powered": enabled}
+        )
 
     async def enable_energy_strategy_scheduled(self, enabled: bool):
         config = pd335_sys_pb2.ConfigWrite()
         config.cfg_energy_strategy_operate_mode.operate_scheduled_open = enabled
-        await self._send_config_packet(config)
+        return await self._send_config_packet(
+            config, expected={"energy_strategy_scheduled": enabled}
+        )
 
     async def enable_energy_strategy_tou(self, enabled: bool):
         config = pd335_sys_pb2.ConfigWrite()
         config.cfg_energy_strategy_operate_mode.operate_tou_mode_open = enabled
-        await self._send_config_packet(config)
+        return await self._send_config_packet(
+            config, expected={"energy_strategy_tou": enabled}
+        )
@@ -1,3 +1,5 @@
+from typing import Any
+
 from bleak.backends.device import BLEDevice
 from bleak.backends.scanner import AdvertisementData
 from google.protobuf.message import Message
@@ -35,6 +37,7 @@ class _DcChargingMaxField(
         list_field=pb.plug_in_info_pv_chg_max_list.pv_chg_max_item,
         value_field=lambda x: x.pv_chg_amp_max,
         per_item=True,
+        key_field=lambda x: x.pv_chg_vol_type,
     )
 ):
     vol_type: int
@@ -48,6 +51,7 @@ class _DcAmpSettingField(
         list_field=pb.pv_dc_chg_setting_list.list_info,
         value_field=lambda x: x.pv_chg_amp_limit,
         per_item=True,
+        key_field=lambda x: (x.pv_chg_vol_spec, x.pv_plug_index),
     )
 ):
     vol_type: int
@@ -168,17 +172,25 @@ class Device(DeviceBase, ProtobufProps):
     def _after_message_parsed(self):
         pass
 
-    async def _send_config_packet(self, message: Message):
+    async def _send_config_packet(
+        self, message: Message, expected: dict[str, Any] | None = None
+    ):
+        if self._add_to_batch(self._send_config_packet, message, expected):
+            return True
+
         payload = message.SerializeToString()
         packet = Packet(0x20, 0x02, 0xFE, 0x11, payload, 0x01, 0x01, 0x13)
-        await self._conn.sendPacket(packet)
+        return await self._send_confirmed_packet(
+            packet, pd335_sys_pb2.ConfigWriteAck, expected
+        )
 
     async def set_energy_backup_battery_level(self, value: int):
         config = pd335_sys_pb2.ConfigWrite()
         config.cfg_energy_backup.energy_backup_en = True
         config.cfg_energy_backup.energy_backup_start_soc = value
-        await self._send_config_packet(config)
-        return True
+        return await self._send_config_packet(
+            config, expected={"energy_backup_battery_level": value}
+        )
 
     async def enable_energy_backup(self, enabled: bool):
         config = pd335_sys_pb2.ConfigWrite()
@@ -187,16 +199,20 @@ class Device(DeviceBase, ProtobufProps):
             config.cfg_energy_backup.energy_backup_start_soc = (
                 self.energy_backup_battery_level
             )
-        await self._send_config_packet(config)
+        return await self._send_config_packet(
+            config, expected={"energy_backup": enabled}
+        )
 
     async def enable_dc_12v_port(self, enabled: bool):
-        await self._send_config_packet(
-            pd335_sys_pb2.ConfigWrite(cfg_dc_12v_out_open=enabled)
+        return await self._send_config_packet(
+            pd335_sys_pb2.ConfigWrite(cfg_dc_12v_out_open=enabled),
+            expected={"dc_12v_port": enabled},
         )
 
     async def enable_ac_ports(self, enabled: bool):
-        await self._send_config_packet(
-            pd335_sys_pb2.ConfigWrite(cfg_ac_out_open=enabled)
+        return await self._send_config_packet(
+            pd335_sys_pb2.ConfigWrite(cfg_ac_out_open=enabled),
+            expected={"ac_ports": enabled},
         )
 
     async def set_battery_charge_limit_min(self, limit: int):
@@ -206,8 +222,10 @@ class Device(DeviceBase, ProtobufProps):
         ):
             return False
 
-        await self._send_config_packet(pd335_sys_pb2.ConfigWrite(cfg_min_dsg_soc=limit))
-        return True
+        return await self._send_config_packet(
+            pd335_sys_pb2.ConfigWrite(cfg_min_dsg_soc=limit),
+            expected={"battery_charge_limit_min": limit},
+        )
 
     async def set_battery_charge_limit_max(self, limit: int):
         if (
@@ -216,8 +234,10 @@ class Device(DeviceBase, ProtobufProps):
         ):
             return False
 
-        await self._send_config_packet(pd335_sys_pb2.ConfigWrite(cfg_max_chg_soc=limit))
-        return True
+        return await self._send_config_packet(
+            pd335_sys_pb2.ConfigWrite(cfg_max_chg_soc=limit),
+            expected={"battery_charge_limit_max": limit},
+        )
 
     async def set_ac_charging_speed(self, value: int):
         if (
@@ -227,13 +247,13 @@ class Device(DeviceBase, ProtobufProps):
         ):
             return False
 
-        await self._send_config_packet(
+        return await self._send_config_packet(
             pd335_sys_pb2.ConfigWrite(
                 cfg_ac_in_chg_mode=pd335_sys_pb2.AC_IN_CHG_MODE_SELF_DEF_POW,
                 cfg_plug_in_info_ac_in_chg_pow_max=value,
-            )
+            ),
+            expected={"ac_charging_speed": value},
         )
-        return True
 
     async def set_dc_charging_amps_max(
         self,
@@ -252,10 +272,16 @@ class Device(DeviceBase, ProtobufProps):
         config.cfg_pv_dc_chg_setting.pv_chg_vol_spec = pd335_sys_pb2.PV_CHG_VOL_SPEC_12V
         config.cfg_pv_dc_chg_setting.pv_chg_amp_limit = value
 
-        await self._send_config_packet(config)
-        return True
+        # only the setting of the first plug is exposed as a field
+        expected = (
+            {"dc_charging_max_amps": value}
+            if plug_index == pd335_sys_pb2.PV_PLUG_INDEX_1
+            else None
+        )
+        return await self._send_config_packet(config, expected)
 
     async def enable_disable_grid_bypass(self, enabled: bool):
-        await self._send_config_packet(
-            pd335_sys_pb2.ConfigWrite(cfg_bypass_out_disable=enabled)
+        return await self._send_config_packet(
+            pd335_sys_pb2.ConfigWrite(cfg_bypass_out_disable=enabled),
+            expected={"disable_grid_bypass": enabled},
         )
@@ -1,3 +1,5 @@
+from typing import Any
+
 from bleak.backends.device import BLEDevice
 from bleak.backends.scanner import AdvertisementData
 from google.protobuf.message import Message
@@ -135,17 +137,25 @@ class Device(DeviceBase, ProtobufProps):
             round(power, 2) if state == DCPortState.SOLAR and power is not None else 0
         )
 
-    async def _send_config_packet(self, message: Message):
+    async def _send_config_packet(
+        self, message: Message, expected: dict[str, Any] | None = None
+    ):
+        if self._add_to_batch(self._send_config_packet, message, expected):
+            return True
+
         payload = message.SerializeToString()
         packet = Packet(0x20, 0x02, 0xFE, 0x11, payload, 0x01, 0x01, 0x13)
-        await self._conn.sendPacket(packet)
+        return await self._send_confirmed_packet(
+            packet, mr521_pb2.ConfigWriteAck, expected
+        )
 
     async def set_energy_backup_battery_level(self, value: int):
         config = mr521_pb2.ConfigWrite()
         config.cfg_energy_backup.energy_backup_en = True
         config.cfg_energy_backup.energy_backup_start_soc = value
-        await self._send_config_packet(config)
-        return True
+        return await self._send_config_packet(
+            config, expected={"energy_backup_battery_level": value}
+        )
 
     async def enable_energy_backup(self, enabled: bool):
         config = mr521_pb2.ConfigWrite()
@@ -154,21 +164,26 @@ class Device(DeviceBase, ProtobufProps):
             config.cfg_energy_backup.energy_backup_start_soc = (
                 self.energy_backup_battery_level
             )
-        await self._send_config_packet(config)
+        return await self._send_config_packet(
+            config, expected={"energy_backup": enabled}
+        )
 
     async def enable_dc_12v_port(self, enabled: bool):
-        await self._send_config_packet(
-            mr521_pb2.ConfigWrite(cfg_dc_12v_out_open=enabled)
+        return await self._send_config_packet(
+            mr521_pb2.ConfigWrite(cfg_dc_12v_out_open=enabled),
+            expected={"dc_12v_port": enabled},
         )
 
     async def enable_ac_hv_port(self, enabled: bool):
-        await self._send_config_packet(
-            mr521_pb2.ConfigWrite(cfg_hv_ac_out_open=enabled)
+        return await self._send_config_packet(
+            mr521_pb2.ConfigWrite(cfg_hv_ac_out_open=enabled),
+            expected={"ac_hv_port": enabled},
         )
 
     async def enable_ac_lv_port(self, enabled: bool):
-        await self._send_config_packet(
-            mr521_pb2.ConfigWrite(cfg_lv_ac_out_open=enabled)
+        return await self._send_config_packet(
+            mr521_pb2.ConfigWrite(cfg_lv_ac_out_open=enabled),
+            expected={"ac_lv_port": enabled},
         )
 
     async def set_battery_charge_limit_min(self, limit: int):
@@ -178,8 +193,10 @@ class Device(DeviceBase, ProtobufProps):
         ):
             return False
 
-        await self._send_config_packet(mr521_pb2.ConfigWrite(cfg_min_dsg_soc=limit))
-        return True
+        return await self._send_config_packet(
+            mr521_pb2.ConfigWrite(cfg_min_dsg_soc=limit),
+            expected={"battery_charge_limit_min": limit},
+        )
 
     async def set_battery_charge_limit_max(self, limit: int):
         if (
@@ -188,8 +205,10 @@ class Device(DeviceBase, ProtobufProps):
         ):
             return False
 
-        await self._send_config_packet(mr521_pb2.ConfigWrite(cfg_max_chg_soc=limit))
-        return True
+        return await self._send_config_packet(
+            mr521_pb2.ConfigWrite(cfg_max_chg_soc=limit),
+            expected={"battery_charge_limit_max": limit},
+        )
 
     async def set_ac_charging_speed(self, value: int):
         if (
@@ -199,7 +218,7 @@ class Device(DeviceBase, ProtobufProps):
         ):
             return False
 
-        await self._send_config_packet(
-            mr521_pb2.ConfigWrite(cfg_plug_in_info_ac_in_chg_pow_max=value)
+        return await self._send_config_packet(
+            mr521_pb2.ConfigWrite(cfg_plug_in_info_ac_in_chg_pow_max=value),
+            expected={"ac_charging_speed": value},
         )
-        return True
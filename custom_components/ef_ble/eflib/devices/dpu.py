@@ -18,7 +18,10 @@ pb_bp_info = proto_attr_mapper(yj751_sys_pb2.BpInfoReport)
 @dataclass
 class _BatteryLevel(
     repeated_pb_field_type(
-        list_field=pb_bp_info.bp_info, value_field=lambda x: x.bp_soc, per_item=True
+        list_field=pb_bp_info.bp_info,
+        value_field=lambda x: x.bp_soc,
+        per_item=True,
+        key_field=lambda x: x.bp_no,
     )
 ):
     battery_no: int
@@ -1,3 +1,5 @@
+from typing import Any
+
 from bleak.backends.device import BLEDevice
 from bleak.backends.scanner import AdvertisementData
 
@@ -30,6 +32,7 @@ class _StatField(
         list_field=pb.display_statistics_sum.list_info,
         value_field=lambda x: x.statistics_content,
         per_item=True,
+        key_field=lambda x: x.statistics_object,
     )
 ):
     stat: pr705_pb2.STATISTICS_OBJECT
@@ -169,17 +172,25 @@ class Device(DeviceBase, ProtobufProps):
 
         return processed
 
-    async def _send_config_packet(self, message):
+    async def _send_config_packet(
+        self, message, expected: dict[str, Any] | None = None
+    ):
+        if self._add_to_batch(self._send_config_packet, message, expected):
+            return True
+
         payload = message.SerializeToString()
         packet = Packet(0x20, 0x02, 0xFE, 0x11, payload, 0x01, 0x01, 0x13)
-        await self._conn.sendPacket(packet)
+        return await self._send_confirmed_packet(
+            packet, pr705_pb2.ConfigWriteAck, expected
+        )
 
     async def set_energy_backup_battery_level(self, value: int):
         config = pr705_pb2.ConfigWrite()
         config.cfg_energy_backup.energy_backup_en = True
         config.cfg_energy_backup.energy_backup_start_soc = value
-        await self._send_config_packet(config)
-        return True
+        return await self._send_config_packet(
+            config, expected={"energy_backup_battery_level": value}
+        )
 
     async def enable_energy_backup(self, enabled: bool):
         config = pr705_pb2.ConfigWrite()
@@ -188,15 +199,21 @@ class Device(DeviceBase, ProtobufProps):
             config.cfg_energy_backup.energy_backup_start_soc = (
                 self.energy_backup_battery_level
             )
-        await self._send_config_packet(config)
+        return await self._send_config_packet(
+            config, expected={"energy_backup": enabled}
+        )
 
     async def enable_dc_12v_port(self, enabled: bool):
-        await self._send_config_packet(
-            pr705_pb2.ConfigWrite(cfg_dc_12v_out_open=enabled)
+        return await self._send_config_packet(
+            pr705_pb2.ConfigWrite(cfg_dc_12v_out_open=enabled),
+            expected={"dc_12v_port": enabled},
         )
 
     async def enable_ac_ports(self, enabled: bool):
-        await self._send_config_packet(pr705_pb2.ConfigWrite(cfg_ac_out_open=enabled))
+        return await self._send_config_packet(
+            pr705_pb2.ConfigWrite(cfg_ac_out_open=enabled),
+            expected={"ac_ports": enabled},
+        )
 
     async def set_battery_charge_limit_min(self, limit: int):
         if (
@@ -205,8 +222,10 @@ class Device(DeviceBase, ProtobufProps):
         ):
             return False
 
-        await self._send_config_packet(pr705_pb2.ConfigWrite(cfg_min_dsg_soc=limit))
-        return True
+        return await self._send_config_packet(
+            pr705_pb2.ConfigWrite(cfg_min_dsg_soc=limit),
+            expected={"battery_charge_limit_min": limit},
+        )
 
     async def set_battery_charge_limit_max(self, limit: int):
         if (
@@ -215,10 +234,10 @@ class Device(DeviceBase, ProtobufProps):
         ):
             return False
 
-        await self._send_config_packet(
-            message=pr705_pb2.ConfigWrite(cfg_max_chg_soc=limit)
+        return await self._send_config_packet(
+            message=pr705_pb2.ConfigWrite(cfg_max_chg_soc=limit),
+            expected={"battery_charge_limit_max": limit},
         )
-        return True
 
     async def set_ac_charging_speed(self, value: int):
         if (
@@ -228,14 +247,15 @@ class Device(DeviceBase, ProtobufProps):
         ):
             return False
 
-        await self._send_config_packet(
-            pr705_pb2.ConfigWrite(cfg_plug_in_info_ac_in_chg_pow_max=value)
+        return await self._send_config_packet(
+            pr705_pb2.ConfigWrite(cfg_plug_in_info_ac_in_chg_pow_max=value),
+            expected={"ac_charging_speed": value},
         )
-        return True
 
     async def set_dc_charging_type(self, state: DcChargingType):
-        await self._send_config_packet(
-            pr705_pb2.ConfigWrite(cfg_pv_chg_type=state.value)
+        return await self._send_config_packet(
+            pr705_pb2.ConfigWrite(cfg_pv_chg_type=state.value),
+            expected={"dc_charging_type": state},
         )
 
     async def set_dc_charging_amps_max(self, value: int):
@@ -246,7 +266,7 @@ class Device(DeviceBase, ProtobufProps):
         ):
             return False
 
-        await self._send_config_packet(
-            pr705_pb2.ConfigWrite(cfg_plug_in_info_pv_dc_amp_max=value)
+        return await self._send_config_packet(
+            pr705_pb2.ConfigWrite(cfg_plug_in_info_pv_dc_amp_max=value),
+            expected={"dc_charging_max_amps": value},
         )
-        return True
@@ -21,7 +21,10 @@ class Device(river3.Device):
     led_mode = pb_field(river3.pb.led_mode, LedMode.from_value)
 
     async def set_led_mode(self, state: LedMode):
-        await self._send_config_packet(pr705_pb2.ConfigWrite(cfg_led_mode=state.value))
+        return await self._send_config_packet(
+            pr705_pb2.ConfigWrite(cfg_led_mode=state.value),
+            expected={"led_mode": state},
+        )
 
     @property
     def device(self):
@@ -1,6 +1,3 @@
-from collections.abc import Sequence
-from dataclasses import dataclass
-
 from ..commands import TimeCommands
 from ..devicebase import AdvertisementData, BLEDevice, DeviceBase
 from ..packet import Packet
@@ -8,9 +5,9 @@ from ..pb import pd303_pb2
 from ..props import (
     Field,
     ProtobufProps,
+    array_pb_field_type,
     pb_field,
     proto_attr_mapper,
-    repeated_pb_field_type,
 )
 from ..props.enums import IntFieldValue
 from ..props.protobuf_field import TransformIfMissing
@@ -45,32 +42,18 @@ class PVStatus(IntFieldValue):
     LV_AND_HV = 3
 
 
-@dataclass
-class CircuitPowerField(
-    repeated_pb_field_type(list_field=pb_time.load_info.hall1_watt)
-):
-    idx: int
-
-    def get_item(self, value: Sequence[float]) -> float | None:
-        return value[self.idx] if value and len(value) > self.idx else None
-
-
-@dataclass
-class CircuitCurrentField(
-    repeated_pb_field_type(list_field=pb_time.load_info.hall1_curr)
-):
-    idx: int
+class CircuitPowerField(array_pb_field_type(list_field=pb_time.load_info.hall1_watt)):
+    pass
 
-    def get_item(self, value: Sequence[float]) -> float | None:
-        return round(value[self.idx], 4) if value and len(value) > self.idx else None
 
+class CircuitCurrentField(array_pb_field_type(list_field=pb_time.load_info.hall1_curr)):
+    def transform_item(self, value: float) -> float:
+        return round(value, 4)
 
-@dataclass
-class ChannelPowerField(repeated_pb_field_type(list_field=pb_time.watt_info.ch_watt)):
-    idx: int
 
-    def get_item(self, value: Sequence[float]) -> float | None:
-        return round(value[self.idx], 2) if value and len(value) > self.idx else None
+class ChannelPowerField(array_pb_field_type(list_field=pb_time.watt_info.ch_watt)):
+    def transform_item(self, value: float) -> float:
+        return round(value, 2)
 
 
 def _errors(error_codes: pd303_pb2.ErrCode):
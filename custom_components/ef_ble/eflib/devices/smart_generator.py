@@ -1,3 +1,5 @@
+from typing import Any
+
 from bleak.backends.device import BLEDevice
 from bleak.backends.scanner import AdvertisementData
 
@@ -7,6 +9,7 @@ from ..packet import Packet
 from ..pb import ge305_sys_pb2
 from ..props import ProtobufProps, pb_field, proto_attr_mapper
 from ..props.enums import IntFieldValue
+from ..props.utils import to_float32
 
 pb = proto_attr_mapper(ge305_sys_pb2.DisplayPropertyUpload)
 
@@ -147,34 +150,45 @@ class Device(DeviceBase, ProtobufProps):
 
         return processed
 
-    async def _send_config_packet(self, message: ge305_sys_pb2.ConfigWrite):
+    async def _send_config_packet(
+        self, message: ge305_sys_pb2.ConfigWrite, expected: dict[str, Any] | None = None
+    ):
+        if self._add_to_batch(self._send_config_packet, message, expected):
+            return True
+
         payload = message.SerializeToString()
         packet = Packet(0x20, 0x08, 0xFE, 0x11, payload, 0x01, 0x01, 0x13)
-        await self._conn.sendPacket(packet)
+        return await self._send_confirmed_packet(
+            packet, ge305_sys_pb2.ConfigWriteAck, expected
+        )
 
     async def enable_ac_port(self, enabled: bool):
-        await self._send_config_packet(
-            ge305_sys_pb2.ConfigWrite(cfg_ac_out_open=enabled)
+        return await self._send_config_packet(
+            ge305_sys_pb2.ConfigWrite(cfg_ac_out_open=enabled),
+            expected={"ac_port": enabled},
         )
 
     async def enable_self_start(self, enabled: bool):
-        await self._send_config_packet(
-            ge305_sys_pb2.ConfigWrite(cfg_generator_self_on=enabled)
+        return await self._send_config_packet(
+            ge305_sys_pb2.ConfigWrite(cfg_generator_self_on=enabled),
+            expected={"self_start": enabled},
         )
 
     async def enable_engine_on(self, enabled: bool):
         value = EngineOpen.OPENED if enabled else EngineOpen.CLOSED
-        await self._send_config_packet(
-            ge305_sys_pb2.ConfigWrite(cfg_generator_engine_open=value.value)
+        return await self._send_config_packet(
+            ge305_sys_pb2.ConfigWrite(cfg_generator_engine_open=value.value),
+            expected={"engine_on": enabled},
         )
 
     async def enable_lpg_level_monitoring(self, enabled: bool):
-        await self._send_config_packet(
+        return await self._send_config_packet(
             ge305_sys_pb2.ConfigWrite(
                 cfg_generator_lpg_monitor_en=enabled,
                 cfg_fuels_liquefied_gas_uint=self.liquefied_gas_unit,
                 cfg_fuels_liquefied_gas_val=self.liquefied_gas_value,
-            )
+            ),
+            expected={"lpg_level_monitoring": enabled},
         )
 
     async def set_liquefied_gas_unit(self, value: LiquefiedGasUnit):
@@ -191,31 +205,38 @@ class Device(DeviceBase, ProtobufProps):
             ):
                 gas_value = round(self.liquefied_gas_value / 2.2, 1)
 
-        await self._send_config_packet(
+        expected: dict[str, Any] = {"liquefied_gas_unit": value}
+        if gas_value is not None:
+            expected["liquefied_gas_value"] = to_float32(gas_value)
+
+        return await self._send_config_packet(
             ge305_sys_pb2.ConfigWrite(
                 cfg_fuels_liquefied_gas_uint=value.value,
                 cfg_fuels_liquefied_gas_val=gas_value,
-            )
+            ),
+            expected,
         )
 
     async def set_liquefied_gas_value(self, value: float):
-        await self._send_config_packet(
+        return await self._send_config_packet(
             ge305_sys_pb2.ConfigWrite(
                 cfg_fuels_liquefied_gas_val=value,
                 cfg_fuels_liquefied_gas_uint=self.liquefied_gas_unit,
-            )
+            ),
+            expected={"liquefied_gas_value": to_float32(value)},
         )
-        return True
 
     async def set_engine_open(self, engine_open: EngineOpen):
         if engine_open is EngineOpen.CLOSING:
-            return
+            return False
 
-        await self._send_config_packet(
-            ge305_sys_pb2.ConfigWrite(cfg_generator_engine_open=engine_open.value)
+        return await self._send_config_packet(
+            ge305_sys_pb2.ConfigWrite(cfg_generator_engine_open=engine_open.value),
+            expected={"engine_state": engine_open},
         )
 
     async def set_performance_mode(self, performance_mode: PerformanceMode):
-        await self._send_config_packet(
-            ge305_sys_pb2.ConfigWrite(cfg_generator_perf_mode=performance_mode.value)
+        return await self._send_config_packet(
+            ge305_sys_pb2.ConfigWrite(cfg_generator_perf_mode=performance_mode.value),
+            expected={"performance_mode": performance_mode},
         )
@@ -43,7 +43,7 @@ class Device(smart_generator.Device, ProtobufProps):
             or limit > self.dc_output_power_max
         ):
             return False
-        await self._send_config_packet(
-            ge305_sys_pb2.ConfigWrite(cfg_generator_dc_out_pow_max=limit)
+        return await self._send_config_packet(
+            ge305_sys_pb2.ConfigWrite(cfg_generator_dc_out_pow_max=limit),
+            expected={"dc_output_power_limit": limit},
         )
-        return True
@@ -1,5 +1,6 @@
 import time
 from collections.abc import Sequence
+from typing import Any
 
 from ..devicebase import DeviceBase
 from ..packet import Packet
@@ -131,59 +132,75 @@ class Device(DeviceBase, ProtobufProps):
 
         return processed
 
-    async def _send_config_packet(self, message: bk_series_pb2.ConfigWrite):
+    async def _send_config_packet(
+        self, message: bk_series_pb2.ConfigWrite, expected: dict[str, Any] | None = None
+    ):
+        if self._add_to_batch(self._send_config_packet, message, expected):
+            return True
+
         payload = message.SerializeToString()
         message.cfg_utc_time = round(time.time())
         packet = Packet(0x20, 0x02, 0xFE, 0x11, payload, 0x01, 0x01, 0x13)
-        await self._conn.sendPacket(packet)
+        return await self._send_confirmed_packet(
+            packet, bk_series_pb2.ConfigWriteAck, expected
+        )
 
     async def set_battery_charge_limit_max(self, limit: int):
-        await self._send_config_packet(bk_series_pb2.ConfigWrite(cfg_max_chg_soc=limit))
-        return True
+        return await self._send_config_packet(
+            bk_series_pb2.ConfigWrite(cfg_max_chg_soc=limit),
+            expected={"battery_charge_limit_max": limit},
+        )
 
     async def set_battery_charge_limit_min(self, limit: int):
-        await self._send_config_packet(bk_series_pb2.ConfigWrite(cfg_min_dsg_soc=limit))
-        return True
+        return await self._send_config_packet(
+            bk_series_pb2.ConfigWrite(cfg_min_dsg_soc=limit),
+            expected={"battery_charge_limit_min": limit},
+        )
 
     async def enable_ac_1(self, enable: bool):
-        await self._send_config_packet(
-            bk_series_pb2.ConfigWrite(cfg_relay2_onoff=enable)
+        return await self._send_config_packet(
+            bk_series_pb2.ConfigWrite(cfg_relay2_onoff=enable),
+            expected={"ac_1": enable},
         )
 
     async def enable_ac_2(self, enable: bool):
-        await self._send_config_packet(
-            bk_series_pb2.ConfigWrite(cfg_relay3_onoff=enable)
+        return await self._send_config_packet(
+            bk_series_pb2.ConfigWrite(cfg_relay3_onoff=enable),
+            expected={"ac_2": enable},
         )
 
     async def set_energy_backup_battery_level(self, value: int):
-        await self._send_config_packet(
-            bk_series_pb2.ConfigWrite(cfg_backup_reverse_soc=value)
+        return await self._send_config_packet(
+            bk_series_pb2.ConfigWrite(cfg_backup_reverse_soc=value),
+            expected={"energy_backup_battery_level": value},
         )
-        return True
 
     async def set_feed_grid_pow_limit(self, value: int):
         if self.feed_grid_pow_max is None or value > self.feed_grid_pow_max:
             return False
-        await self._send_config_packet(
-            bk_series_pb2.ConfigWrite(cfg_feed_grid_mode_pow_limit=value)
+        return await self._send_config_packet(
+            bk_series_pb2.ConfigWrite(cfg_feed_grid_mode_pow_limit=value),
+            expected={"feed_grid_pow_limit": value},
         )
-        return True
 
     async def enable_feed_grid(self, enable: bool):
-        await self._send_config_packet(
-            bk_series_pb2.ConfigWrite(cfg_feed_grid_mode=2 if enable else 1)
+        return await self._send_config_packet(
+            bk_series_pb2.ConfigWrite(cfg_feed_grid_mode=2 if enable else 1),
+            expected={"feed_grid": enable},
         )
 
     async def set_energy_strategy(self, strategy: EnergyStrategy):
         cfg = bk_series_pb2.ConfigWrite()
         strategy.as_pb(cfg.cfg_energy_strategy_operate_mode)
-        await self._send_config_packet(cfg)
+        return await self._send_config_packet(
+            cfg, expected={"energy_strategy": strategy}
+        )
 
     async def set_load_power(self, limit: int):
         if self._resident_load is None:
             return False
 
-        await self._send_config_packet(
+        return await self._send_config_packet(
             bk_series_pb2.ConfigWrite(
                 cfg_day_resident_load_list=bk_series_pb2.DayResidentLoadList(
                     load=[
@@ -194,6 +211,6 @@ class Device(DeviceBase, ProtobufProps):
                         )
                     ]
                 )
-            )
+            ),
+            expected={"base_load_power": limit},
         )
-        return True
@@ -105,7 +105,7 @@ class Device(DeviceBase, RawDataProps):
         self.reset_updated()
 
         if packet.src == 0x42 and packet.cmdSet == 0x42 and packet.cmdId == 0x50:
-            self.update_from_bytes(KT210SAC, packet.payload)
+            self.update_fields_from_bytes(KT210SAC, packet.payload)
             processed = True
 
             if self.wte_fth_en is not None and self.main_mode is not None:
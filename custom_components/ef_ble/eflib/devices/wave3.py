@@ -1,4 +1,5 @@
 import logging
+from typing import Any
 
 from ..devicebase import DeviceBase
 from ..packet import Packet
@@ -122,10 +123,19 @@ class Device(DeviceBase, ProtobufProps):
         self.update_state("power", self.power)
         return processed
 
-    async def _send_config_packet(self, message: ac517_apl_comm_pb2.ConfigWrite):
+    async def _send_config_packet(
+        self,
+        message: ac517_apl_comm_pb2.ConfigWrite,
+        expected: dict[str, Any] | None = None,
+    ):
+        if self._add_to_batch(self._send_config_packet, message, expected):
+            return True
+
         payload = message.SerializeToString()
         packet = Packet(0x20, 0x14, 0xFE, 0x11, payload, 0x01, 0x01, 0x13)
-        await self._conn.sendPacket(packet)
+        return await self._send_confirmed_packet(
+            packet, ac517_apl_comm_pb2.ConfigWriteAck, expected
+        )
 
     async def set_battery_charge_limit_min(self, limit: int):
         if (
@@ -134,10 +144,10 @@ class Device(DeviceBase, ProtobufProps):
         ):
             return False
 
-        await self._send_config_packet(
-            ac517_apl_comm_pb2.ConfigWrite(cfg_min_dsg_soc=limit)
+        return await self._send_config_packet(
+            ac517_apl_comm_pb2.ConfigWrite(cfg_min_dsg_soc=limit),
+            expected={"battery_charge_limit_min": limit},
         )
-        return True
 
     async def set_battery_charge_limit_max(self, limit: int):
         if (
@@ -146,13 +156,14 @@ class Device(DeviceBase, ProtobufProps):
         ):
             return False
 
-        await self._send_config_packet(
-            ac517_apl_comm_pb2.ConfigWrite(cfg_max_chg_soc=limit)
+        return await self._send_config_packet(
+            ac517_apl_comm_pb2.ConfigWrite(cfg_max_chg_soc=limit),
+            expected={"battery_charge_limit_max": limit},
         )
-        return True
 
     async def enable_power(self, enabled: bool):
         # cfg_sys_pause=True means standby, False means running
-        await self._send_config_packet(
-            ac517_apl_comm_pb2.ConfigWrite(cfg_sys_pause=not enabled)
+        return await self._send_config_packet(
+            ac517_apl_comm_pb2.ConfigWrite(cfg_sys_pause=not enabled),
+            expected={"power": enabled},
         )
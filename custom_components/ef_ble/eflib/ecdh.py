@@ -0,0 +1,266 @@
+"""
+ECDH key exchange on SECP160r1, the only curve used by the connection handshake
+
+Generic curve libraries spend most of the handshake in python-level overhead of
+their point classes. This module does only what the handshake needs:
+
+- key pair generation multiplies the fixed base point, which is done with a table of
+  precomputed base point multiples (one for every 4-bit window of the scalar), so it
+  takes only point additions and no doublings
+- shared secret multiplies the device public key with a 4-bit fixed window
+
+Points are kept in Jacobian coordinates during multiplication, so only the final result
+needs a modular inversion.
+"""
+
+import asyncio
+import functools
+import secrets
+from collections import deque
+from dataclasses import dataclass
+from typing import Self
+
+_P = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFF7FFFFFFF
+_A = _P - 3
+_B = 0x1C97BEFC54BD7A8B65ACF89F81D4D4ADC565FA45
+_GX = 0x4A96B5688EF573284664698968C38BB913CBFC82
+_GY = 0x23A628553168947D59DCC912042351377AC5FB32
+_N = 0x0100000000000000000001F4C8F927AED3CA752257
+
+_COORDINATE_SIZE = 20
+PUBLIC_KEY_SIZE = 2 * _COORDINATE_SIZE
+
+_WINDOW_BITS = 4
+_WINDOW_SIZE = 1 << _WINDOW_BITS
+_WINDOW_MASK = _WINDOW_SIZE - 1
+_WINDOWS = (_N.bit_length() + _WINDOW_BITS - 1) // _WINDOW_BITS
+
+type _Affine = tuple[int, int]
+# Point at infinity has Z == 0
+type _Jacobian = tuple[int, int, int]
+
+_INFINITY: _Jacobian = (1, 1, 0)
+
+
+def _double(point: _Jacobian) -> _Jacobian:
+    # dbl-2001-b, uses a == -3
+    x, y, z = point
+    if z == 0 or y == 0:
+        return _INFINITY
+
+    delta = z * z % _P
+    gamma = y * y % _P
+    beta = x * gamma % _P
+    alpha = 3 * (x - delta) * (x + delta) % _P
+    x3 = (alpha * alpha - 8 * beta) % _P
+    z3 = ((y + z) ** 2 - gamma - delta) % _P
+    y3 = (alpha * (4 * beta - x3) - 8 * gamma * gamma) % _P
+    return x3, y3, z3
+
+
+def _add_affine(point: _Jacobian, other: _Affine) -> _Jacobian:
+    # madd-2007-bl
+    x1, y1, z1 = point
+    x2, y2 = other
+    if z1 == 0:
+        return x2, y2, 1
+
+    z1z1 = z1 * z1 % _P
+    h = (x2 * z1z1 - x1) % _P
+    r = 2 * (y2 * z1 * z1z1 - y1) % _P
+    if h == 0:
+        return _double(point) if r == 0 else _INFINITY
+
+    hh = h * h % _P
+    i = 4 * hh
+    j = h * i
+    v = x1 * i
+    x3 = (r * r - j - 2 * v) % _P
+    y3 = (r * (v - x3) - 2 * y1 * j) % _P
+    z3 = ((z1 + h) ** 2 - z1z1 - hh) % _P
+    return x3, y3, z3
+
+
+def _to_affine(point: _Jacobian) -> _Affine:
+    x, y, z = point
+    if z == 0:
+        raise ValueError("Point at infinity has no affine coordinates")
+
+    z_inv = pow(z, -1, _P)
+    z_inv2 = z_inv * z_inv % _P
+    return x * z_inv2 % _P, y * z_inv2 * z_inv % _P
+
+
+def _batch_to_affine(points: list[_Jacobian]) -> list[_Affine]:
+    # Montgomery's trick - one modular inversion for all points instead of one each
+    products = []
+    product = 1
+    for _, _, z in points:
+        product = product * z % _P
+        products.append(product)
+
+    inverse = pow(product, -1, _P)
+    result = []
+    for index in range(len(points) - 1, -1, -1):
+        x, y, z = points[index]
+        z_inv = inverse * products[index - 1] % _P if index else inverse
+        inverse = inverse * z % _P
+        z_inv2 = z_inv * z_inv % _P
+        result.append((x * z_inv2 % _P, y * z_inv2 * z_inv % _P))
+
+    result.reverse()
+    return result
+
+
+def _multiples(point: _Affine) -> list[_Affine]:
+    """Return `[1 * point, 2 * point, ..., 15 * point]`"""
+    multiples: list[_Jacobian] = [(*point, 1)]
+    for _ in range(_WINDOW_SIZE - 2):
+        multiples.append(_add_affine(multiples[-1], point))
+    return _batch_to_affine(multiples)
+
+
+@functools.cache
+def _base_table() -> list[list[_Affine]]:
+    """Return multiples of `16^i * G` for every window `i` of the scalar"""
+    table = []
+    base: _Affine = (_GX, _GY)
+    for _ in range(_WINDOWS):
+        multiples = _multiples(base)
+        table.append(multiples)
+        # 16 * base = 2 * (8 * base)
+        base = _to_affine(_double((*multiples[7], 1)))
+    return table
+
+
+def _multiply_base(scalar: int) -> _Affine:
+    result = _INFINITY
+    for multiples in _base_table():
+        if digit := scalar & _WINDOW_MASK:
+            result = _add_affine(result, multiples[digit - 1])
+        scalar >>= _WINDOW_BITS
+    return _to_affine(result)
+
+
+def _multiply(point: _Affine, scalar: int) -> _Affine:
+    # Same doubling and addition as _double and _add_affine, inlined as this loop is
+    # where the handshake spends most of its time
+    p = _P
+    multiples = _multiples(point)
+    x, y, z = _INFINITY
+    for shift in range((_WINDOWS - 1) * _WINDOW_BITS, -1, -_WINDOW_BITS):
+        if z:
+            for _ in range(_WINDOW_BITS):
+                delta = z * z % p
+                gamma = y * y % p
+                beta = x * gamma
+                alpha = 3 * (x - delta) * (x + delta) % p
+                x = (alpha * alpha - 8 * beta) % p
+                z = ((y + z) ** 2 - gamma - delta) % p
+                y = (alpha * (4 * beta - x) - 8 * gamma * gamma) % p
+
+        if not (digit := (scalar >> shift) & _WINDOW_MASK):
+            continue
+
+        x2, y2 = multiples[digit - 1]
+        z1z1 = z * z % p
+        h = (x2 * z1z1 - x) % p
+        if z == 0 or h == 0:
+            x, y, z = _add_affine((x, y, z), (x2, y2))
+            continue
+
+        r = 2 * (y2 * z * z1z1 - y) % p
+        hh = h * h % p
+        i = 4 * hh
+        j = h * i
+        v = x * i
+        x3 = (r * r - j - 2 * v) % p
+        y = (r * (v - x3) - 2 * y * j) % p
+        z = ((z + h) ** 2 - z1z1 - hh) % p
+        x = x3
+
+    return _to_affine((x, y, z))
+
+
+def _decode_point(data: bytes) -> _Affine:
+    if len(data) != PUBLIC_KEY_SIZE:
+        raise ValueError(
+            f"Public key must be {PUBLIC_KEY_SIZE} bytes long, got {len(data)}"
+        )
+
+    x = int.from_bytes(data[:_COORDINATE_SIZE])
+    y = int.from_bytes(data[_COORDINATE_SIZE:])
+    if x >= _P or y >= _P or (y * y - (x * x * x + _A * x + _B)) % _P != 0:
+        raise ValueError("Public key is not a point on SECP160r1")
+    return x, y
+
+
+@dataclass(frozen=True, slots=True)
+class KeyPair:
+    """Ephemeral SECP160r1 key pair"""
+
+    private_key: int
+    public_key: bytes
+
+    @classmethod
+    def generate(cls) -> Self:
+        private_key = secrets.randbelow(_N - 1) + 1
+        x, y = _multiply_base(private_key)
+        return cls(
+            private_key,
+            x.to_bytes(_COORDINATE_SIZE) + y.to_bytes(_COORDINATE_SIZE),
+        )
+
+    def shared_secret(self, peer_public_key: bytes) -> bytes:
+        """Return X coordinate of the shared point, same as `ecdsa.ECDH` would"""
+        x, _ = _multiply(_decode_point(peer_public_key), self.private_key)
+        return x.to_bytes(_COORDINATE_SIZE)
+
+
+class KeyPairPool:
+    """
+    Process-wide pool of key pairs generated ahead of time in the thread executor
+
+    Connections start refilling the pool when they begin to connect, so by the time the
+    link is up and the device waits for our public key, a ready pair is just taken from
+    the pool. Each pair is handed out only once.
+    """
+
+    def __init__(self, size: int = 4) -> None:
+        self._size = size
+        self._pairs: deque[KeyPair] = deque()
+        self._refill_task: asyncio.Task | None = None
+
+    def __len__(self):
+        return len(self._pairs)
+
+    async def acquire(self) -> KeyPair:
+        """Take a pre-generated key pair, or generate one if the pool ran dry"""
+        if self._pairs:
+            pair = self._pairs.popleft()
+        else:
+            pair = await asyncio.get_running_loop().run_in_executor(
+                None, KeyPair.generate
+            )
+        self.refill()
+        return pair
+
+    def refill(self) -> None:
+        """Start generating key pairs in background until the pool is full"""
+        if len(self._pairs) >= self._size:
+            return
+
+        task = self._refill_task
+        loop = asyncio.get_running_loop()
+        if task is not None and not task.done() and task.get_loop() is loop:
+            return
+
+        self._refill_task = loop.create_task(self._fill())
+
+    async def _fill(self) -> None:
+        loop = asyncio.get_running_loop()
+        while len(self._pairs) < self._size:
+            self._pairs.append(await loop.run_in_executor(None, KeyPair.generate))
+
+
+key_pair_pool = KeyPairPool()
@@ -1,9 +1,10 @@
 import struct
 
-from Crypto.Cipher import AES
-from Crypto.Util.Padding import pad
+from .cipher import SessionCipher
+from .crc import Crc16
 
-from .crc import crc16
+_HEADER_SIZE = 6
+_LENGTH = struct.Struct("<H")
 
 
 class EncPacket:
@@ -25,33 +26,128 @@ class EncPacket:
         payload,
         cmd_id=0,
         version=0,
-        enc_key=None,
-        iv=None,
+        cipher: SessionCipher | None = None,
     ):
         self._frame_type = frame_type
         self._payload_type = payload_type
         self._payload = payload
         self._cmd_id = cmd_id
         self._version = version
-        self._enc_key = enc_key
-        self._iv = iv
+        self._cipher = cipher
 
     def encryptPayload(self):
-        if self._enc_key is None and self._iv is None:
+        if self._cipher is None:
             return self._payload  # Not encrypted
 
-        engine = AES.new(self._enc_key, AES.MODE_CBC, self._iv)
-        return engine.encrypt(pad(self._payload, AES.block_size))
+        return self._cipher.encrypt_frame(self._payload)
 
     def toBytes(self):
         """Will serialize the internal data to bytes stream"""
         payload = self.encryptPayload()
 
-        data = (
+        header = (
             EncPacket.PREFIX + struct.pack("<B", self._frame_type << 4) + b"\x01"
         )  # Unknown byte
-        data += struct.pack("<H", len(payload) + 2)  # +2 here is len(crc16)
-        data += payload
-        data += struct.pack("<H", crc16(data))
+        header += struct.pack("<H", len(payload) + 2)  # +2 here is len(crc16)
+        crc = Crc16(header).update(payload).digest()
 
-        return data
+        return b"".join((header, payload, struct.pack("<H", crc)))
+
+
+class EncPacketReassembler:
+    """
+    Reassembles EncPackets from the stream of BLE notifications
+
+    Complete frames are returned as memoryviews, either into the received data itself
+    or into the reassembly buffer when the frame was split between notifications, so
+    frames are not copied on the way to decryption. Only the incomplete tail of a
+    notification is copied into the buffer. Memory of returned frames is never reused,
+    so they stay valid for as long as they are referenced, but the data passed to
+    `feed()` must not be modified afterwards.
+
+    When the stream gets out of sync (e.g. a notification was lost) the data is scanned
+    for the next frame prefix instead of dropping everything received so far.
+    """
+
+    def __init__(self, capacity: int = 512):
+        self._buffer = bytearray(capacity)
+        self._read = 0
+        self._write = 0
+        # Number of bytes from the read cursor needed to complete the pending frame
+        self._frame_size = _HEADER_SIZE
+        self.discarded_bytes = 0
+
+    def __len__(self):
+        return self._write - self._read
+
+    def reset(self):
+        """Drop all buffered data"""
+        self._read = self._write
+        self._frame_size = _HEADER_SIZE
+
+    def feed(self, data: bytes) -> list[memoryview]:
+        """Add received notification data and return all frames completed by it"""
+        frames = None
+        if self._read == self._write:
+            frames, end, self._frame_size = self._split(data, 0, len(data))
+            if end == len(data):
+                return frames
+            data = memoryview(data)[end:]
+
+        buffer = self._buffer
+        read = self._read
+        write = self._write
+        end = write + len(data)
+        if end > len(buffer):
+            # Buffer is replaced instead of compacted, returned frames may still point
+            # to it
+            pending = write - read
+            end -= read
+            buffer = bytearray(max(len(buffer), end * 2))
+            buffer[:pending] = memoryview(self._buffer)[read:write]
+            self._buffer = buffer
+            self._read = read = 0
+            write = pending
+
+        buffer[write:end] = data
+        self._write = end
+
+        if frames is not None:
+            return frames
+        if end - read < self._frame_size:
+            return []
+
+        frames, self._read, self._frame_size = self._split(buffer, read, end)
+        return frames
+
+    def _split(
+        self, data: bytes | bytearray, start: int, stop: int
+    ) -> tuple[list[memoryview], int, int]:
+        frames = []
+        while stop - start >= _HEADER_SIZE:
+            # Frame can't be shorter than its crc16, otherwise it's not a real prefix
+            if (
+                data[start] != 0x5A
+                or data[start + 1] != 0x5A
+                or (length := _LENGTH.unpack_from(data, start + 4)[0]) < 2
+            ):
+                start = self._resync(data, start, stop)
+                continue
+
+            end = start + _HEADER_SIZE + length
+            if end > stop:
+                return frames, start, end - start
+
+            frames.append(memoryview(data)[start:end])
+            start = end
+
+        return frames, start, _HEADER_SIZE
+
+    def _resync(self, data: bytes | bytearray, start: int, stop: int) -> int:
+        prefix_start = data.find(EncPacket.PREFIX, start + 1, stop)
+        if prefix_start == -1:
+            # Last byte could be the first half of the prefix from the next notification
+            prefix_start = stop - 1 if data[stop - 1] == 0x5A else stop
+
+        self.discarded_bytes += prefix_start - start
+        return prefix_start
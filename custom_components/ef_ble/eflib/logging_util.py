@@ -262,6 +262,11 @@ class DeviceDiagnostics:
     last_errors: list[tuple[float, str]]
     connect_times: list[float]
     disconnect_times: list[float]
+    write_queue: dict[str, float | int | None] | None
+    commands: dict[str, float | int | None] | None
+    coalesced_writes: dict[str, dict[str, float | int | None]]
+    state_updates: dict[str, float | int]
+    payload_cache: dict[str, float | int | None]
 
     def as_dict(self):
         """Get diagnostics data as dictionary"""
@@ -298,6 +303,11 @@ class DeviceDiagnosticsCollector:
             last_errors=list(self._last_errors),
             connect_times=list(self._connect_times),
             disconnect_times=list(self._disconnect_times),
+            write_queue=self._device.write_queue_stats,
+            commands=self._device.command_stats,
+            coalesced_writes=self._device.coalescing_stats,
+            state_updates=self._device.update_stats,
+            payload_cache=self._device.payload_cache_stats,
         )
 
     @property
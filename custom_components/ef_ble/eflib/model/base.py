@@ -1,6 +1,6 @@
 import struct
+from bisect import bisect_right
 from dataclasses import dataclass, fields
-from functools import cache
 from inspect import get_annotations
 from typing import Annotated, ClassVar, Self, dataclass_transform, get_args, get_origin
 
@@ -17,8 +17,8 @@ class RawData:
     is the name from the original decompiled source code (optional).
 
     This class is also able to decode binary streams partially in case the data uses
-    optional extensions. This works by going through the format in reverse and removing
-    bytes from struct string one by one until the size matches the data size.
+    optional extensions. Structs for every prefix of the fields are compiled when the
+    class is created, and the longest one that fits the data size is used for decoding.
 
     Examples
     --------
@@ -41,12 +41,15 @@ class RawData:
     """
 
     _STRUCT_FMT: ClassVar[str]
+    _FIELD_FMTS: ClassVar[tuple[str, ...]] = ()
+    _PREFIX_SIZES: ClassVar[list[int]]
+    _PREFIX_STRUCTS: ClassVar[list[struct.Struct]]
+    _FIELD_STRUCTS: ClassVar[list[struct.Struct]]
     SIZE: int
 
     def __init_subclass__(cls) -> None:
-        # set byte order to litte-endian (or for subclasses, get the full format str
-        # from parent)
-        format_str = getattr(cls, "_STRUCT_FMT", ["<"])
+        # subclasses extend the format of their parent
+        field_fmts = list(cls._FIELD_FMTS)
 
         for name, annotation in get_annotations(cls).items():
             if get_origin(annotation) is Annotated:
@@ -55,7 +58,7 @@ class RawData:
                 _, *metadata = get_args(annotation)
                 if not metadata:
                     continue
-                format_str += metadata[0]
+                field_fmts.append(metadata[0])
 
                 # by setting all defaults to None, we can construct the class only
                 # partially - messages can be defined with optional extensions depending
@@ -65,12 +68,21 @@ class RawData:
         # make this a dataclass (dataclass is an inline operation)
         dataclass(cls)
 
-        cls._FULL_STRUCT_FMT = format_str
-        cls._STRUCT_FMT = "".join(format_str)
-        cls.SIZE = struct.calcsize(cls._STRUCT_FMT)
+        # all formats are little-endian without padding, so truncating the data can
+        # only drop whole fields from the end
+        cls._FIELD_FMTS = tuple(field_fmts)
+        cls._PREFIX_STRUCTS = [
+            struct.Struct("<" + "".join(field_fmts[:i]))
+            for i in range(len(field_fmts) + 1)
+        ]
+        cls._PREFIX_SIZES = [prefix.size for prefix in cls._PREFIX_STRUCTS]
+        # field i occupies bytes from _PREFIX_SIZES[i] to _PREFIX_SIZES[i + 1]
+        cls._FIELD_STRUCTS = [struct.Struct("<" + fmt) for fmt in field_fmts]
+        cls._STRUCT_FMT = cls._PREFIX_STRUCTS[-1].format
+        cls.SIZE = cls._PREFIX_SIZES[-1]
 
     @classmethod
-    def from_bytes(cls, data: bytes) -> Self:
+    def from_bytes(cls, data: bytes, offset: int = 0) -> Self:
         """
         Unpack bytes to an instance of this class
 
@@ -78,15 +90,17 @@ class RawData:
         ----------
         data
             Bytes to decode
+        offset
+            Position in data where the structure starts
 
         Returns
         -------
         Instance of this class decoded from data
         """
-        return cls(*cls.unpack(data))
+        return cls(*cls.unpack(data, offset))
 
     @classmethod
-    def unpack(cls, data: bytes):
+    def unpack(cls, data: bytes, offset: int = 0):
         """
         Unpack binary data according to the fields defined in this class
 
@@ -94,21 +108,22 @@ class RawData:
         ----------
         data
             Bytes to decode
+        offset
+            Position in data where the structure starts
 
         Returns
         -------
         Tuple of unpacked data types
         """
-        struct_fmt = cls._STRUCT_FMT
-        size = cls.SIZE
-
         # data may not contain all of the extensions so if the size is less than we
-        # expect, we try to remove format characters from the end of the format string
-        # until it matches
-        if (data_len := len(data)) < cls.SIZE:
-            struct_fmt, size = cls._fit_struct_to_data(data_len)
+        # expect, we decode only the fields that fit in it
+        if (data_len := len(data) - offset) < cls.SIZE:
+            if data_len <= 0:
+                return ()
+            prefix_len = bisect_right(cls._PREFIX_SIZES, data_len) - 1
+            return cls._PREFIX_STRUCTS[prefix_len].unpack_from(data, offset)
 
-        return struct.unpack(struct_fmt, data[:size])
+        return cls._PREFIX_STRUCTS[-1].unpack_from(data, offset)
 
     def pack(self):
         return struct.pack(
@@ -137,24 +152,7 @@ class RawData:
 
         offset = obj_size
 
-        if len(data[offset:]) > obj_1.SIZE:
-            ret_list.append(cls.from_bytes(data[offset:]))
+        if len(data) - offset > obj_1.SIZE:
+            ret_list.append(cls.from_bytes(data, offset))
             offset += obj_size
         return ret_list
-
-    @classmethod
-    @cache
-    def _fit_struct_to_data(cls, data_len: int):
-        size = cls.SIZE
-        i = 0
-        reduced_fmt = "".join(cls._FULL_STRUCT_FMT)
-
-        # here, we remove one byte at a time and check if the calculated size fits the
-        # binary data for each loop - if it does, we return the reduced format that is
-        # compatible with the data size and the resulting size
-        while size > data_len:
-            i += 1
-            reduced_fmt = "".join(cls._FULL_STRUCT_FMT[:-i])
-            size = struct.calcsize(reduced_fmt)
-
-        return "".join(cls._FULL_STRUCT_FMT[:-i]), size
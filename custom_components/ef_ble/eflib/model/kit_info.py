@@ -25,13 +25,13 @@ class AllKitDetailData(RawData):
     kit_base_info: list[KitBaseInfo] = field(default_factory=list)
 
     @classmethod
-    def from_bytes(cls, data: bytes) -> Self:
-        parsed = super().from_bytes(data)
+    def from_bytes(cls, data: bytes, offset: int = 0) -> Self:
+        parsed = super().from_bytes(data, offset)
 
-        offset = parsed.SIZE
+        offset += parsed.SIZE
 
         for _ in range(parsed.support_kit_max_num):
-            base_info = KitBaseInfo.from_bytes(data[offset:])
+            base_info = KitBaseInfo.from_bytes(data, offset)
             parsed.kit_base_info.append(base_info)
             offset += base_info.SIZE
         return parsed
@@ -1,15 +1,42 @@
+import functools
 import logging
 import struct
 from typing import TypeGuard
 
-from .crc import crc8, crc16
+from .crc import Crc16, crc8, crc16
 
 _LOGGER = logging.getLogger(__name__)
 
+# Header layouts, V3+ (including V19) adds dsrc/ddst before cmd_set/cmd_id:
+# prefix, version, payload length, header crc8, product byte, seq, 2 static zero
+# bytes, src, dst, [dsrc, ddst,] cmd_set, cmd_id
+_PREAMBLE = struct.Struct("<BBH")
+_HEADER_V2 = struct.Struct("<BBHBB4s2xBBBB")
+_HEADER_V3 = struct.Struct("<BBHBB4s2xBBBBBB")
+_CRC16 = struct.Struct("<H")
+
+
+@functools.cache
+def _xor_table(key: int) -> bytes:
+    return bytes(i ^ key for i in range(256))
+
 
 class Packet:
     """Needed to parse and make the internal packet structure"""
 
+    __slots__ = (
+        "_cmd_id",
+        "_cmd_set",
+        "_ddst",
+        "_dsrc",
+        "_dst",
+        "_payload",
+        "_product_id",
+        "_seq",
+        "_src",
+        "_version",
+    )
+
     PREFIX = b"\xaa"
 
     NET_BLE_COMMAND_CMD_CHECK_RET_TIME = 0x53
@@ -39,9 +66,6 @@ class Packet:
         self._seq = seq if seq is not None else b"\x00\x00\x00\x00"
         self._product_id = product_id
 
-        # For representation
-        self._payload_hex = bytearray(self._payload).hex()
-
     @property
     def src(self):
         return self._src
@@ -59,12 +83,18 @@ class Packet:
         return self._cmd_id
 
     @property
-    def payload(self):
+    def payload(self) -> bytes | memoryview:
+        """
+        Packet payload
+
+        For parsed packets this is a read-only view into the decoded data unless the
+        payload had to be XOR-decoded.
+        """
         return self._payload
 
     @property
     def payloadHex(self):
-        return self._payload_hex
+        return self._payload.hex()
 
     @property
     def dsrc(self):
@@ -82,64 +112,74 @@ class Packet:
     def seq(self):
         return self._seq
 
+    @seq.setter
+    def seq(self, value: bytes):
+        self._seq = value
+
     @property
     def productId(self):
         return self._product_id
 
     @staticmethod
-    def fromBytes(data, is_xor=False):
+    def fromBytes(data: bytes | memoryview, is_xor: bool = False):
         """Deserializes bytes stream into internal data"""
-        if not data.startswith(Packet.PREFIX):
+        data = memoryview(data)
+        if data[:1] != Packet.PREFIX:
             error_msg = "Unable to parse packet - prefix is incorrect: %s"
             _LOGGER.error(error_msg, bytearray(data).hex())
             return InvalidPacket(error_msg % bytearray(data).hex())
 
-        version = data[1]
-        if (version == 2 and len(data) < 18) or (version in [3, 4] and len(data) < 20):
+        version = data[1] if len(data) > 1 else 0
+        header = _HEADER_V2 if version == 2 else _HEADER_V3
+        # there are also version 19 packets that do not contain crc16 checksum
+        has_crc16 = version in [2, 3, 4]
+
+        if len(data) < header.size + (2 if has_crc16 else 0):
             error_msg = "Unable to parse packet - too small: %s"
             _LOGGER.error(error_msg, bytearray(data).hex())
             return InvalidPacket(error_msg % bytearray(data).hex())
 
-        payload_length = struct.unpack("<H", data[2:4])[0]
-
-        # there are also version 19 packets that do not contain crc16 checksum
-        if version in [2, 3, 4]:
-            # Check whole packet CRC16
-            if crc16(data[:-2]) != struct.unpack("<H", data[-2:])[0]:
-                error_msg = "Unable to parse packet - incorrect CRC16: %s"
-                _LOGGER.error(error_msg, bytearray(data).hex())
-                return InvalidPacket(error_msg % bytearray(data).hex())
-
-        # Check header CRC8
-        if crc8(data[:4]) != data[4]:
-            error_msg = "Unable to parse packet - incorrect header CRC8: %s"
+        # Check whole packet CRC16
+        if has_crc16 and crc16(data[:-2]) != _CRC16.unpack_from(data, len(data) - 2)[0]:
+            error_msg = "Unable to parse packet - incorrect CRC16: %s"
             _LOGGER.error(error_msg, bytearray(data).hex())
             return InvalidPacket(error_msg % bytearray(data).hex())
 
-        # data[4] # crc8 of header
-        # product_id = data[5] # We can't determine the product id from the bytestream
-
-        # Seq is used for multiple purposes, so leaving as is
-        seq = data[6:10]
-        # data[10:12] # static zeroes?
-        src = data[12]
-        dst = data[13]
-
         dsrc = ddst = 0
-        payload_start = 16 if version == 2 else 18
-
+        # We can't determine the product id from the bytestream, seq is used for
+        # multiple purposes, so leaving as is
         if version == 2:
-            cmd_set, cmd_id = data[14:payload_start]
+            (_, _, payload_length, header_crc, _, seq, src, dst, cmd_set, cmd_id) = (
+                header.unpack_from(data)
+            )
         else:
-            dsrc, ddst, cmd_set, cmd_id = data[14:payload_start]
+            (
+                _,
+                _,
+                payload_length,
+                header_crc,
+                _,
+                seq,
+                src,
+                dst,
+                dsrc,
+                ddst,
+                cmd_set,
+                cmd_id,
+            ) = header.unpack_from(data)
 
-        payload = b""
-        if payload_length > 0:
-            payload = data[payload_start : payload_start + payload_length]
+        # Check header CRC8
+        if crc8(data[:4]) != header_crc:
+            error_msg = "Unable to parse packet - incorrect header CRC8: %s"
+            _LOGGER.error(error_msg, bytearray(data).hex())
+            return InvalidPacket(error_msg % bytearray(data).hex())
 
-            # If first byte of seq is set - we need to xor payload with it to get the real data
-            if is_xor is True and seq[0] != b"\x00":
-                payload = bytes([c ^ seq[0] for c in payload])
+        payload = data[header.size : header.size + payload_length]
+        if payload_length > 0:
+            # If first byte of seq is set - we need to xor payload with it to get the
+            # real data
+            if is_xor is True and seq[0] != 0:
+                payload = payload.tobytes().translate(_xor_table(seq[0]))
 
             if version == 19 and payload[-2:] == b"\xbb\xbb":
                 payload = payload[:-2]
@@ -158,28 +198,44 @@ class Packet:
 
     def toBytes(self):
         """Will serialize the internal data to bytes stream"""
-        # Header
-        data = Packet.PREFIX
-        data += struct.pack("<B", self._version) + struct.pack("<H", len(self._payload))
-        # Header crc
-        data += struct.pack("<B", crc8(data))
-        # Additional data
-        data += self.productByte() + self._seq
-        data += b"\x00\x00"  # Unknown static zeroes, no strings attached right now
-
-        data += struct.pack("<B", self._src) + struct.pack("<B", self._dst)
+        payload_length = len(self._payload)
+        header_crc = crc8(
+            _PREAMBLE.pack(Packet.PREFIX[0], self._version, payload_length)
+        )
 
         # V3+ includes dsrc/ddst fields, V2 does not
         if self._version >= 0x03:
-            data += struct.pack("<B", self._dsrc) + struct.pack("<B", self._ddst)
+            header = _HEADER_V3.pack(
+                Packet.PREFIX[0],
+                self._version,
+                payload_length,
+                header_crc,
+                self.productByte()[0],
+                self._seq,
+                self._src,
+                self._dst,
+                self._dsrc,
+                self._ddst,
+                self._cmd_set,
+                self._cmd_id,
+            )
+        else:
+            header = _HEADER_V2.pack(
+                Packet.PREFIX[0],
+                self._version,
+                payload_length,
+                header_crc,
+                self.productByte()[0],
+                self._seq,
+                self._src,
+                self._dst,
+                self._cmd_set,
+                self._cmd_id,
+            )
 
-        data += struct.pack("<B", self._cmd_set) + struct.pack("<B", self._cmd_id)
-        # Payload
-        data += self._payload
         # Packet crc
-        data += struct.pack("<H", crc16(data))
-
-        return data
+        crc = Crc16(header).update(self._payload).digest()
+        return b"".join((header, self._payload, _CRC16.pack(crc)))
 
     def productByte(self):
         """Returns magics depends on product id"""
@@ -194,7 +250,7 @@ class Packet:
             f"dst=0x{self._dst:02X}, "
             f"cmd_set=0x{self._cmd_set:02X}, "
             f"cmd_id=0x{self._cmd_id:02X}, "
-            f"payload=bytes.fromhex('{self._payload_hex}'), "
+            f"payload=bytes.fromhex('{self.payloadHex}'), "
             f"dsrc=0x{self._dsrc:02X}, "
             f"ddst=0x{self._ddst:02X}, "
             f"version=0x{self._version:02X}, "
@@ -212,6 +268,8 @@ class Packet:
 class InvalidPacket(Packet):
     """Represents an invalid packet that could not be parsed"""
 
+    __slots__ = ("error_message",)
+
     def __init__(self, error_message: str):
         super().__init__(src=0, dst=0, cmd_set=0, cmd_id=0, payload=b"")
         self.error_message = error_message
@@ -0,0 +1,53 @@
+from collections.abc import Hashable
+from typing import Any
+
+
+class PayloadCache:
+    """
+    Remembers the last payload decoded for each key to skip identical ones
+
+    Devices resend the same reports back to back, and decoding a payload that is
+    identical to the previous one of the same kind cannot change any field. Payloads
+    are compared byte by byte, which costs less than hashing them and can't collide.
+    Each entry also holds the result of decoding, so it can be returned on a hit.
+    """
+
+    def __init__(self) -> None:
+        self._entries: dict[Hashable, tuple[bytes, Any]] = {}
+
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, payload: bytes | memoryview) -> Any | None:
+        """Get result stored for key if payload is identical to its last payload"""
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == payload:
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        return None
+
+    def put(self, key: Hashable, payload: bytes | memoryview, result: Any):
+        # Payloads might be views into buffers that are reused for next packets
+        self._entries[key] = (bytes(payload), result)
+
+    def invalidate(self, key: Hashable | None = None):
+        """Forget last payload of key, or of all keys if no key is provided"""
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    @property
+    def hit_ratio(self) -> float | None:
+        """Share of payloads that were skipped as identical to the previous one"""
+        total = self.hits + self.misses
+        return self.hits / total if total else None
+
+    def stats(self) -> dict[str, float | int | None]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hit_ratio,
+        }
@@ -1,12 +1,13 @@
 from .protobuf_field import pb_field, proto_attr_mapper, proto_has_attr
 from .protobuf_props import ProtobufProps
-from .repeated_protobuf_field import repeated_pb_field_type
+from .repeated_protobuf_field import array_pb_field_type, repeated_pb_field_type
 from .updatable_props import Field, UpdatableProps
 
 __all__ = [
     "Field",
     "ProtobufProps",
     "UpdatableProps",
+    "array_pb_field_type",
     "pb_field",
     "proto_attr_mapper",
     "proto_has_attr",
@@ -112,12 +112,25 @@ class ProtobufField[T](Field[T]):
         if (value := self._get_value(value)) is Skip:
             return
 
+        self.set_extracted(instance, value)
+
+    def set_extracted(self, instance: "ProtobufProps", value: Any):
+        """Assign value that was already read from the message attribute"""
         value = self.transform_value(value)
         if value is Skip:
             return
 
         super().__set__(instance, value)
 
+    def _set_value(self, instance, value):
+        if isinstance(value, Message):
+            # Parsed messages are reused for next packets, so field has to keep its
+            # own copy instead of reference to part of the message
+            message = type(value)()
+            message.CopyFrom(value)
+            value = message
+        super()._set_value(instance, value)
+
 
 @overload
 def pb_field[T_ATTR](
@@ -1,16 +1,174 @@
+from array import array
 from collections import defaultdict
 from collections.abc import Callable
 from functools import cached_property
+from typing import ClassVar
 
 from google.protobuf.message import Message
 
 from .. import devicebase
 from ..logging_util import LogOptions
 from .protobuf_field import ProtobufField
-from .repeated_protobuf_field import ProtobufRepeatedField
+from .repeated_protobuf_field import (
+    ProtobufArrayField,
+    ProtobufCompositeRepeatedField,
+    ProtobufRepeatedField,
+)
+from .slim_message import slim_message_type
 from .updatable_props import UpdatableProps
 
 
+class _ExtractionPlan:
+    """
+    Prefix tree of attribute paths of all fields read from one message type
+
+    Each sub-message is checked and accessed once, and its attributes are passed to
+    every field whose path passes through it, instead of every field walking its full
+    path from the root message.
+    """
+
+    def __init__(self) -> None:
+        self.leaves: dict[str, list[ProtobufField]] = defaultdict(list)
+        self.children: dict[str, _ExtractionPlan] = {}
+        # Repeated fields by name of the top-level attribute, then by path of the list
+        # and whether they are array fields
+        self.repeated: dict[
+            str, dict[tuple[str, bool], list[ProtobufRepeatedField]]
+        ] = defaultdict(lambda: defaultdict(list))
+
+    def add(self, field: ProtobufField, depth: int = 0):
+        attrs = field.pb_field.attrs
+        if isinstance(field, ProtobufRepeatedField):
+            # Array fields are updated together, so they are kept apart from other
+            # repeated fields of the same list
+            group = (field.pb_field.name, isinstance(field, ProtobufArrayField))
+            self.repeated[attrs[0]][group].append(field)
+            return
+
+        if depth == len(attrs) - 1:
+            self.leaves[attrs[depth]].append(field)
+            return
+
+        if (child := self.children.get(attrs[depth])) is None:
+            child = self.children[attrs[depth]] = _ExtractionPlan()
+        child.add(field, depth + 1)
+
+    @cached_property
+    def _attrs(self) -> set[str]:
+        return {*self.leaves, *self.children, *self.repeated}
+
+    @cached_property
+    def _if_missing(self) -> list[tuple[str, ProtobufField]]:
+        return [
+            (attr, field)
+            for attr, fields in self.leaves.items()
+            for field in fields
+            if field.process_if_missing
+        ]
+
+    def extract(self, instance: "ProtobufProps", message: Message):
+        """Update fields of instance from message using the cheaper strategy"""
+        # Every field present in serialized message takes at least 2 bytes, so this
+        # is the upper bound of number of fields ListFields would return
+        if message.ByteSize() // 2 <= len(self._attrs):
+            self.apply_present(instance, message)
+        else:
+            self.apply(instance, message)
+
+    def apply(self, instance: "ProtobufProps", message: Message):
+        """Check presence of every attribute used by the fields"""
+        for attr, fields in self.leaves.items():
+            if message.HasField(attr):
+                value = getattr(message, attr)
+                for field in fields:
+                    field.set_extracted(instance, value)
+                continue
+
+            for field in fields:
+                if field.process_if_missing:
+                    field.set_extracted(instance, None)
+
+        for attr, child in self.children.items():
+            if message.HasField(attr):
+                child.apply(instance, getattr(message, attr))
+
+        for repeated_fields in self.repeated.values():
+            self._apply_repeated(instance, message, repeated_fields)
+
+    def apply_present(self, instance: "ProtobufProps", message: Message):
+        """Visit only top-level attributes present in sparse message"""
+        present = set()
+        for descriptor, value in message.ListFields():
+            if (attr := descriptor.name) not in self._attrs:
+                continue
+            present.add(attr)
+
+            for field in self.leaves.get(attr, ()):
+                field.set_extracted(instance, value)
+
+            if (child := self.children.get(attr)) is not None:
+                child.apply(instance, value)
+
+            if (repeated_fields := self.repeated.get(attr)) is not None:
+                self._apply_repeated(instance, message, repeated_fields)
+
+        for attr, field in self._if_missing:
+            if attr not in present:
+                field.set_extracted(instance, None)
+
+    def _apply_repeated(
+        self,
+        instance: "ProtobufProps",
+        message: Message,
+        repeated_fields: dict[tuple[str, bool], list[ProtobufRepeatedField]],
+    ):
+        for fields in repeated_fields.values():
+            field_list = fields[0].get_list(message)
+            if isinstance(fields[0], ProtobufArrayField):
+                ProtobufArrayField.update_items(instance, fields, field_list)
+                continue
+
+            indices = {}
+            for field in fields:
+                if (
+                    # Scanning the list stops at the first match, which is cheaper
+                    # than building the index for a single field
+                    len(fields) == 1
+                    or not isinstance(field, ProtobufCompositeRepeatedField)
+                    or field.key_field is None
+                ):
+                    setattr(instance, field.public_name, field_list)
+                    continue
+
+                if (index := indices.get(field.key_field)) is None:
+                    index = indices[field.key_field] = field.index_items(field_list)
+                field.set_from_index(instance, index)
+
+
+class _MessagePool:
+    """
+    Message instances reused for parsing packets, one per message type
+
+    Memory of sub-messages cleared by parsing into a message is kept by the message
+    until it's deleted, so each instance is replaced after `max_uses` parses to keep
+    memory from growing.
+    """
+
+    def __init__(self, max_uses: int = 64) -> None:
+        self._max_uses = max_uses
+        self._messages: dict[type[Message], tuple[Message, int]] = {}
+
+    def parse[T_MSG: Message](self, message_type: type[T_MSG], data: bytes) -> T_MSG:
+        message, uses = self._messages.get(message_type, (None, 0))
+        if message is None or uses >= self._max_uses:
+            message, uses = message_type(), 0
+
+        # ParseFromString clears the message before parsing
+        message.ParseFromString(data)
+        self._messages[message_type] = (message, uses + 1)
+        return message  # pyright: ignore[reportReturnType]
+
+
 class ProtobufProps(UpdatableProps):
     """
     Mixin for augmenting device classes with properties parsed from protobuf messages
@@ -38,30 +196,50 @@ class ProtobufProps(UpdatableProps):
 
     """
 
-    _repeated_field_map: dict[type[Message], dict[str, list[ProtobufRepeatedField]]] = (
-        defaultdict(lambda: defaultdict(list))
-    )
+    _extraction_plans: ClassVar[
+        dict[tuple[type["ProtobufProps"], type[Message]], _ExtractionPlan]
+    ] = {}
 
     @classmethod
-    def add_repeated_field(cls, repeated_field: ProtobufRepeatedField):
-        updated_field_map = cls._repeated_field_map.copy()
-        updated_field_map[repeated_field.pb_field.message_type][
-            repeated_field.pb_field.name
-        ].append(repeated_field)
-        cls._repeated_field_map = updated_field_map
+    def _extraction_plan(cls, message_type: type[Message]) -> _ExtractionPlan:
+        key = (cls, message_type)
+        if (plan := ProtobufProps._extraction_plans.get(key)) is not None:
+            return plan
 
-    @cached_property
-    def message_to_field(self) -> dict[type[Message], list[ProtobufField]]:
-        field_map = defaultdict(list)
-        for field in self._fields:
-            if isinstance(field, ProtobufRepeatedField):
-                continue
+        plan = ProtobufProps._extraction_plans[key] = _ExtractionPlan()
+        for field in cls._fields:
+            if (
+                isinstance(field, ProtobufField)
+                and field.pb_field.message_type is message_type
+            ):
+                plan.add(field)
+        return plan
 
-            if not isinstance(field, ProtobufField):
-                continue
+    _parse_types: ClassVar[
+        dict[tuple[type["ProtobufProps"], type[Message]], type[Message]]
+    ] = {}
+
+    @classmethod
+    def _parse_type(cls, message_type: type[Message]) -> type[Message]:
+        """Get message type that decodes only attributes used by fields of class"""
+        key = (cls, message_type)
+        if (parse_type := ProtobufProps._parse_types.get(key)) is not None:
+            return parse_type
+
+        paths = [
+            field.pb_field.attrs
+            for field in cls._fields
+            if isinstance(field, ProtobufField)
+            and field.pb_field.message_type is message_type
+        ]
+        try:
+            parse_type = slim_message_type(message_type, paths)
+        except Exception:  # noqa: BLE001
+            # Fall back to decoding the whole message
+            parse_type = message_type
 
-            field_map[field.pb_field.message_type].append(field)
-        return field_map
+        ProtobufProps._parse_types[key] = parse_type
+        return parse_type
 
     def reset_updated(self):
         self._processed_fields = []
@@ -76,19 +254,31 @@ class ProtobufProps(UpdatableProps):
         message
             Protocol buffer message to update fields from
         """
+        self._update_from_message(type(message), message, reset)
+
+    def _update_from_message(
+        self, message_type: type[Message], message: Message, reset: bool = False
+    ):
         if reset:
             self.reset_updated()
 
-        for field in self.message_to_field[type(message)]:
-            setattr(self, field.public_name, message)
+        self._extraction_plan(message_type).extract(self, message)
 
-        for repeated_fields in self._repeated_field_map[type(message)].values():
-            field_list = repeated_fields[0].get_list(message)
-            if field_list is None:
-                continue
+    @cached_property
+    def _array_items(self) -> dict[str, array]:
+        """Items of lists from the last message, by path of array fields"""
+        return {}
+
+    @cached_property
+    def _message_pool(self) -> _MessagePool:
+        return _MessagePool()
 
-            for field in repeated_fields:
-                setattr(self, field.public_name, field_list)
+    @property
+    def _logs_messages(self) -> bool:
+        return (
+            isinstance(self, devicebase.DeviceBase)
+            and LogOptions.DESERIALIZED_MESSAGES in self._logger.options
+        )
 
     @cached_property
     def _log_message(self) -> Callable[[Message], None]:
@@ -112,8 +302,36 @@ class ProtobufProps(UpdatableProps):
         serialized_message: bytes,
         reset: bool = False,
     ) -> T_MSG:
-        msg = message_type()
-        msg.ParseFromString(serialized_message)
-        self.update_from_message(msg, reset=reset)
+        """
+        Parse message from bytes and update defined fields from it
+
+        Only attributes used by fields are decoded, unless deserialized messages are
+        logged, so the returned message might not contain other attributes. Message
+        instance is reused for the next message of the same type, so the returned
+        message is valid only until then.
+
+        Devices skip payloads identical to the previous one of the same message type,
+        as they can't change any field, and return the message parsed from it.
+        """
+        cache = self._payload_cache if isinstance(self, devicebase.DeviceBase) else None
+        logs_messages = self._logs_messages
+        if reset:
+            self.reset_updated()
+        if (
+            cache is not None
+            and not logs_messages
+            and (msg := cache.get(message_type, serialized_message)) is not None
+        ):
+            return msg
+
+        parse_type = message_type if logs_messages else self._parse_type(message_type)
+        # Pooled message is parsed over, and a payload that fails to update fields must
+        # not be skipped next time, so the entry is stored again only after success
+        if cache is not None:
+            cache.invalidate(message_type)
+        msg = self._message_pool.parse(parse_type, serialized_message)
+        self._update_from_message(message_type, msg)
+        if cache is not None:
+            cache.put(message_type, serialized_message, msg)
         self._log_message(msg)
-        return msg
+        return msg  # pyright: ignore[reportReturnType]
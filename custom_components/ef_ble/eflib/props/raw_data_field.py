@@ -62,6 +62,10 @@ class RawDataField[T](Field[T]):
         return getattr(value, self.data_attr.attr)
 
     def __set__(self, instance: "RawDataProps", value: Any):
+        if isinstance(value, RawData) and self._get_value(value) is None:
+            # field is an extension that was not included in the received data
+            return
+
         value = self._get_value(value)
         value = self._transform_value(value)
         super().__set__(instance, value)
@@ -1,8 +1,10 @@
 import abc
+from bisect import bisect_right
 from collections import defaultdict
 from collections.abc import Callable
+from dataclasses import fields
 from functools import cached_property
-from typing import Literal, overload
+from typing import Any, ClassVar, Literal, overload
 
 from .. import devicebase
 from ..connection import LogOptions
@@ -11,6 +13,112 @@ from .raw_data_field import RawDataField
 from .updatable_props import UpdatableProps
 
 
+class _RawDecoder:
+    """
+    Updates fields of one props class from payloads of one data type
+
+    Besides decoding all values of a payload, it can decode only fields whose byte
+    ranges differ from the previous payload of the same length, so fixed-layout
+    reports that are resent mostly unchanged cost only as much as changes of bytes
+    that are actually read by fields.
+    """
+
+    def __init__(self, props_cls: type["RawDataProps"], data: type[RawData]) -> None:
+        value_indices = {
+            data_field.name: i
+            for i, data_field in enumerate(fields(data)[: len(data._FIELD_FMTS)])
+        }
+        self.data = data
+        self.prefix_sizes = data._PREFIX_SIZES
+        self.field_structs = data._FIELD_STRUCTS
+
+        # (value index, field slot, transform)
+        self.steps: list[tuple[int, int, Callable[[Any], Any]]] = []
+        # The same steps grouped by value index
+        self.steps_by_value: list[list[tuple[int, int, Callable[[Any], Any]]]] = [
+            [] for _ in data._FIELD_FMTS
+        ]
+        for field in props_cls._fields:
+            if (
+                not isinstance(field, RawDataField)
+                or field.data_attr.message_type != data
+            ):
+                continue
+            if (value_index := value_indices.get(field.data_attr.attr)) is None:
+                raise TypeError(
+                    f"Field '{field.public_name}' reads attribute "
+                    f"'{field.data_attr.attr}' that is not decoded from bytes of "
+                    f"{data.__name__}, use `update_from_bytes` instead"
+                )
+            step = (value_index, field.index, field._transform_value)
+            self.steps.append(step)
+            self.steps_by_value[value_index].append(step)
+
+        # Bits of bytes that hold values read by any field
+        self.read_bits = 0
+        for value_index, steps in enumerate(self.steps_by_value):
+            if steps:
+                offset, end = self.prefix_sizes[value_index : value_index + 2]
+                self.read_bits |= ((1 << (end - offset) * 8) - 1) << offset * 8
+
+    def decode(self, instance: "RawDataProps", values: tuple[Any, ...]):
+        field_values = instance._field_values
+        values_len = len(values)
+        updated = 0
+        try:
+            for value_index, slot, transform in self.steps:
+                if value_index >= values_len:
+                    # extension that was not included in the received data
+                    continue
+                value = transform(values[value_index])
+                if value != field_values[slot]:
+                    field_values[slot] = value
+                    updated |= 1 << slot
+        finally:
+            instance._updated_mask |= updated
+
+    def decode_changed(self, instance: "RawDataProps", payload: bytes, previous: bytes):
+        """Decode fields whose bytes differ from previous payload of the same length"""
+        changed = (
+            int.from_bytes(previous, "little") ^ int.from_bytes(payload, "little")
+        ) & self.read_bits
+        if changed.bit_count() > len(self.steps):
+            # finding each changed value costs more than a few values of a full decode,
+            # so when many of them changed, it's cheaper to decode all at once
+            self.decode(instance, self.data.unpack(payload))
+            return
+
+        prefix_sizes = self.prefix_sizes
+        # bytes of extensions that were not included are not decoded at all
+        decoded_size = prefix_sizes[bisect_right(prefix_sizes, len(payload)) - 1]
+
+        field_values = instance._field_values
+        updated = 0
+        try:
+            while changed:
+                changed_byte = ((changed & -changed).bit_length() - 1) >> 3
+                if changed_byte >= decoded_size:
+                    break
+
+                value_index = bisect_right(prefix_sizes, changed_byte) - 1
+                # the rest of bytes of this value don't need to be checked
+                end_bits = prefix_sizes[value_index + 1] * 8
+                changed = changed >> end_bits << end_bits
+
+                if not (steps := self.steps_by_value[value_index]):
+                    continue
+                (raw,) = self.field_structs[value_index].unpack_from(
+                    payload, prefix_sizes[value_index]
+                )
+                for _, slot, transform in steps:
+                    value = transform(raw)
+                    if value != field_values[slot]:
+                        field_values[slot] = value
+                        updated |= 1 << slot
+        finally:
+            instance._updated_mask |= updated
+
+
 class RawDataProps(UpdatableProps, abc.ABC):
     def update_from_data(self, data: RawData, reset: bool = False):
         if reset:
@@ -48,6 +156,57 @@ class RawDataProps(UpdatableProps, abc.ABC):
 
         return msgs if as_list else msgs[0]
 
+    def update_fields_from_bytes(
+        self, data: type[RawData], payload: bytes, reset: bool = False
+    ):
+        """
+        Decode payload directly into fields without building message instance
+
+        Unpacked values are passed to fields through a decoder prepared once per device
+        class and data type. If the previous payload of the same type had the same
+        length, only fields whose bytes changed are decoded, and identical payloads are
+        skipped. Message instance is only built if deserialized messages are logged, so
+        unlike `update_from_bytes`, nothing is returned.
+        """
+        if reset:
+            self.reset_updated()
+
+        decoder = self._decoder(data)
+        previous = self._raw_payloads.pop(data, None)
+        if previous is None or len(previous) != len(payload):
+            decoder.decode(self, data.unpack(payload))
+        elif previous != payload:
+            decoder.decode_changed(self, payload, previous)
+        # kept only after a successful decode, so failed fields are retried
+        self._raw_payloads[data] = payload
+
+        if self._logs_messages:
+            self._log_message(data.from_bytes(payload))
+
+    _decoders: ClassVar[
+        dict[tuple[type["RawDataProps"], type[RawData]], _RawDecoder]
+    ] = {}
+
+    @classmethod
+    def _decoder(cls, data: type[RawData]) -> _RawDecoder:
+        """Get decoder that updates fields of class from payloads of data"""
+        key = (cls, data)
+        if (decoder := RawDataProps._decoders.get(key)) is None:
+            decoder = RawDataProps._decoders[key] = _RawDecoder(cls, data)
+        return decoder
+
+    @cached_property
+    def _raw_payloads(self) -> dict[type[RawData], bytes]:
+        """Last payload decoded into fields, by data type"""
+        return {}
+
+    @property
+    def _logs_messages(self) -> bool:
+        return (
+            isinstance(self, devicebase.DeviceBase)
+            and LogOptions.DESERIALIZED_MESSAGES in self._logger.options
+        )
+
     @cached_property
     def _log_message(self) -> Callable[[RawData], None]:
         if not isinstance(self, devicebase.DeviceBase):
@@ -1,9 +1,11 @@
 import abc
-from collections.abc import Callable, Sequence
-from dataclasses import dataclass
+from array import array
+from collections.abc import Callable, Hashable, Sequence
+from dataclasses import dataclass, fields
 from typing import (
     TYPE_CHECKING,
     Any,
+    ClassVar,
     Literal,
     cast,
     dataclass_transform,
@@ -62,10 +64,6 @@ class ProtobufRepeatedField[T_ITEM, T_OUT](ProtobufField[T_OUT]):
     def get_item(self, value: Sequence[T_ITEM]) -> T_OUT | None:
         """Process item from sequence returned from `get_list`"""
 
-    def __set_name__(self, owner: type["ProtobufProps"], name: str):
-        super().__set_name__(owner, name)
-        owner.add_repeated_field(self)
-
     def __set__(self, instance: "ProtobufProps", value: Sequence[Any]):
         if (item := self.get_item(value)) is None:
             return
@@ -76,16 +74,100 @@ class ProtobufRepeatedField[T_ITEM, T_OUT](ProtobufField[T_OUT]):
 class ProtobufCompositeRepeatedField[T_ITEM, T_OUT](
     ProtobufRepeatedField[T_ITEM, T_OUT]
 ):
+    """
+    Repeated field that takes its value from one matching item of the list
+
+    If the type is created with `key_field`, fields reading the same list share one
+    index of its items by that key, built once per message. Key of each field is made
+    from values of its dataclass attributes, in declaration order, so they have to
+    match values returned from `key_field`.
+    """
+
+    key_field: ClassVar[Callable[[Any], Hashable] | None] = None
+
+    def __post_init__(self):
+        values = tuple(getattr(self, field.name) for field in fields(self))
+        self.key = values[0] if len(values) == 1 else values
+
     def get_item(self, value: Sequence[T_ITEM]) -> T_OUT | None:
         for item in value:
             if (result := self.get_value(item)) is not None:
                 return result
         return None
 
+    def index_items(self, value: Sequence[T_ITEM]) -> dict[Hashable, T_ITEM]:
+        """Index items by `key_field`, the first item wins like in `get_item`"""
+        index = {}
+        if self.key_field is not None:
+            for item in value:
+                index.setdefault(self.key_field(item), item)
+        return index
+
+    def set_from_index(self, instance: "ProtobufProps", index: dict[Hashable, T_ITEM]):
+        if (item := index.get(self.key)) is None:
+            return
+
+        if (result := self.get_value(item)) is None:
+            return
+
+        self._set_value(instance, result)
+
     @abc.abstractmethod
     def get_value(self, item: T_ITEM) -> T_OUT | None: ...
 
 
+class ProtobufArrayField(ProtobufRepeatedField[float, Any]):
+    """
+    Field holding one item of repeated scalar list, addressed by its index
+
+    All array fields reading the same list are updated together - the list is
+    converted to a compact array once per message and compared with the array from
+    the previous message, so only fields of changed items are assigned.
+
+    Do not use this class directly - use `array_pb_field_type` for better typing
+    """
+
+    typecode: ClassVar[str] = "f"
+
+    idx: int
+
+    def transform_item(self, value: float) -> Any:
+        """Process value of item before it's assigned to the field"""
+        return value
+
+    def get_item(self, value: Sequence[float]) -> Any:
+        return self.transform_item(value[self.idx]) if len(value) > self.idx else None
+
+    @staticmethod
+    def update_items(
+        instance: "ProtobufProps",
+        fields: Sequence["ProtobufArrayField"],
+        value: Sequence[float],
+    ):
+        """Assign items of list to all fields, skipping items that didn't change"""
+        items = array(fields[0].typecode, value)
+        key = fields[0].pb_field.name
+        previous = instance._array_items.get(key)
+        if previous == items:
+            return
+        instance._array_items[key] = items
+
+        n_items = len(items)
+        n_previous = len(previous) if previous is not None else 0
+        for field in fields:
+            if (idx := field.idx) >= n_items:
+                continue
+
+            if (
+                previous is not None
+                and idx < n_previous
+                and previous[idx] == items[idx]
+            ):
+                continue
+
+            field._set_value(instance, field.transform_item(items[idx]))
+
+
 def _raise[T_IN](v: T_IN, exc: type[Exception]) -> T_IN:
     raise exc
 
@@ -95,6 +177,7 @@ def repeated_pb_field_type[T_ITEM, T_OUT](
     list_field: Sequence[T_ITEM],
     value_field: Callable[[T_ITEM], T_OUT] = lambda x: _raise(x, NotImplementedError),
     per_item: Literal[True] = True,
+    key_field: Callable[[T_ITEM], Hashable] | None = None,
 ) -> type[ProtobufCompositeRepeatedField[T_ITEM, T_OUT]]: ...
 
 
@@ -103,6 +186,7 @@ def repeated_pb_field_type[T_ITEM, T_OUT](
     list_field: Sequence[T_ITEM],
     value_field: Callable[[T_ITEM], T_OUT] = lambda x: _raise(x, NotImplementedError),
     per_item: Literal[False] = False,
+    key_field: None = None,
 ) -> type[ProtobufRepeatedField[T_ITEM, T_OUT]]: ...
 
 
@@ -110,6 +194,7 @@ def repeated_pb_field_type[T_ITEM, T_OUT](
     list_field: Sequence[T_ITEM],
     value_field: Callable[[T_ITEM], T_OUT] = lambda x: _raise(x, NotImplementedError),
     per_item: bool = False,
+    key_field: Callable[[T_ITEM], Hashable] | None = None,
 ) -> (
     type[ProtobufRepeatedField[T_ITEM, T_OUT]]
     | type[ProtobufCompositeRepeatedField[T_ITEM, T_OUT]]
@@ -139,6 +224,23 @@ def repeated_pb_field_type[T_ITEM, T_OUT](
             return value[1].value
     ```
 
+    Per item fields can be declared with `key_field`, so their items are looked up
+    from an index shared by all fields of the list instead of scanning it
+    ```
+    class SomeItemField(
+        repeated_pb_field_type(
+            list_field=pb.some_list,
+            value_field=lambda x: x.value,
+            per_item=True,
+            key_field=lambda x: x.id,
+        )
+    ):
+        id: int
+
+        def get_value(self, item: some_pb2.RecordType):
+            return item.value if item.id == self.id else None
+    ```
+
     Returns
     -------
         Type of repeated protobuf message
@@ -153,4 +255,41 @@ def repeated_pb_field_type[T_ITEM, T_OUT](
     class CustomPerItemRepeatedField(ProtobufCompositeRepeatedField[T_ITEM, T_OUT]):
         pb_field = list_field
 
+    if key_field is not None:
+        CustomPerItemRepeatedField.key_field = staticmethod(key_field)
+
     return CustomPerItemRepeatedField
+
+
+def array_pb_field_type(
+    list_field: Sequence[float], typecode: str = "f"
+) -> type[ProtobufArrayField]:
+    """
+    Create array field type from protobuf accessor representing repeated scalars
+
+    Parameters
+    ----------
+    list_field
+        Protobuf accessor of repeated scalar attribute
+    typecode, optional
+        Typecode of `array` that holds values of the list without loss, "f" for float
+        and "d" for double attributes
+
+    Usage
+    -----
+    ```
+    class SomeArrayField(array_pb_field_type(list_field=pb.some_list)):
+        def transform_item(self, value: float) -> float:
+            return round(value, 2)
+
+    class Device(DeviceBase, ProtobufProps):
+        first_item = SomeArrayField(0)
+        second_item = SomeArrayField(1)
+    ```
+    """
+
+    class CustomArrayField(ProtobufArrayField):
+        pb_field = list_field
+
+    CustomArrayField.typecode = typecode
+    return CustomArrayField
@@ -0,0 +1,126 @@
+import itertools
+from collections.abc import Sequence
+
+from google.protobuf import descriptor_pb2, descriptor_pool, message_factory
+from google.protobuf.descriptor import Descriptor
+from google.protobuf.message import Message
+
+_slim_file_ids = itertools.count()
+
+# Marks attribute whose value is used as a whole and has to keep its full type
+_WHOLE = None
+
+
+type _AttrTree = dict[str, "_AttrTree | None"]
+
+
+def slim_message_type(
+    message_type: type[Message], paths: Sequence[Sequence[str]]
+) -> type[Message]:
+    """
+    Create message type that decodes only attributes on provided paths
+
+    Attributes that are not on any path are dropped from the message descriptor, so
+    the parser keeps them as unknown fields without decoding them. Sub-messages that
+    are only descended into are slimmed the same way, while the last attribute of
+    each path keeps its original type, as fields and their transforms use its value
+    as a whole.
+
+    Parameters
+    ----------
+    message_type
+        Generated protobuf message class
+    paths
+        Attribute paths from the message, e.g. `["load_info", "hall1_watt"]`
+
+    Returns
+    -------
+        Message class with the same attribute names as `message_type`, but holding
+        only attributes needed for the paths
+
+    Raises
+    ------
+    TypeError
+        If descriptor pool rejects the slimmed descriptors
+    """
+    tree: _AttrTree = {}
+    for path in paths:
+        node = tree
+        for attr in path[:-1]:
+            if attr in node and node[attr] is _WHOLE:
+                break
+            node = node.setdefault(attr, {})
+        else:
+            node[path[-1]] = _WHOLE
+
+    descriptor = message_type.DESCRIPTOR
+    package = f"ef_ble_slim{next(_slim_file_ids)}"
+    file_proto = descriptor_pb2.FileDescriptorProto(
+        name=f"{package}/{descriptor.full_name}.proto",
+        package=package,
+    )
+    original_file = descriptor_pb2.FileDescriptorProto()
+    descriptor.file.CopyToProto(original_file)
+    if original_file.HasField("syntax"):
+        # Missing syntax means proto2
+        file_proto.syntax = original_file.syntax
+
+    dependencies: set[str] = set()
+    _add_slim_message(file_proto, descriptor.name, descriptor, tree, dependencies)
+    file_proto.dependency.extend(sorted(dependencies))
+
+    pool = descriptor_pool.Default()
+    pool.Add(file_proto)
+    return message_factory.GetMessageClass(
+        pool.FindMessageTypeByName(f"{package}.{descriptor.name}")
+    )
+
+
+def _add_slim_message(
+    file_proto: descriptor_pb2.FileDescriptorProto,
+    name: str,
+    descriptor: Descriptor,
+    tree: _AttrTree,
+    dependencies: set[str],
+):
+    original = descriptor_pb2.DescriptorProto()
+    descriptor.CopyToProto(original)
+    # Nested types of the original message are referenced by their full names
+    message_proto = descriptor_pb2.DescriptorProto(name=name)
+    for field in original.field:
+        if field.name in tree:
+            message_proto.field.add().CopyFrom(field)
+    fields = message_proto.field
+
+    # Keep only oneofs of remaining fields, in their original order
+    oneofs = sorted(
+        {field.oneof_index for field in fields if field.HasField("oneof_index")}
+    )
+    for index in oneofs:
+        message_proto.oneof_decl.add().CopyFrom(original.oneof_decl[index])
+    for field in fields:
+        if field.HasField("oneof_index"):
+            field.oneof_index = oneofs.index(field.oneof_index)
+
+    for field in fields:
+        field_descriptor = descriptor.fields_by_name[field.name]
+        if (subtree := tree[field.name]) is not _WHOLE and (
+            field_descriptor.message_type is not None
+        ):
+            # Named by path, the same type can be slimmed differently under each
+            slim_name = f"{name}_{field.name}"
+            _add_slim_message(
+                file_proto,
+                slim_name,
+                field_descriptor.message_type,
+                subtree,
+                dependencies,
+            )
+            field.type_name = f".{file_proto.package}.{slim_name}"
+            continue
+
+        for referenced in (field_descriptor.message_type, field_descriptor.enum_type):
+            if referenced is not None:
+                dependencies.add(referenced.file.name)
+
+    file_proto.message_type.append(message_proto)
@@ -6,9 +6,10 @@ class UpdatableProps:
     """
     Mixin for augmenting device classes with advanced properties
 
-    If any property changed its value after calling `reset_updated`, attribute
-    `updated` is set to True and all updated field names are added to
-    `updated_fields`.
+    Field values are kept in a list preallocated for all fields of the class, each
+    field has its own slot index assigned when the class is created. Changes after
+    calling `reset_updated` are tracked as bits of an integer mask, from which
+    `updated` and `updated_fields` are derived.
 
     Attributes
     ----------
@@ -16,25 +17,41 @@ class UpdatableProps:
         Holds True if any fields are updated after calling `reset_updated`
     """
 
-    updated: bool = False
-    _updated_fields: set[str] | None = None
+    _fields: ClassVar[list["Field[Any]"]] = []
+    _field_values: list[Any]
+    _updated_mask: int
+
+    def __new__(cls, *args, **kwargs):
+        instance = super().__new__(cls)
+        instance._field_values = [None] * len(cls._fields)
+        instance._updated_mask = 0
+        return instance
+
+    @property
+    def updated(self) -> bool:
+        return self._updated_mask != 0
 
     @property
-    def updated_fields(self):
+    def updated_fields(self) -> list[str]:
         """List of field names that were updated after calling `reset_updated`"""
-        if self._updated_fields is None:
-            self._updated_fields = set()
-        return self._updated_fields
+        fields = self._fields
+        mask = self._updated_mask
+        names = []
+        while mask:
+            lowest = mask & -mask
+            names.append(fields[lowest.bit_length() - 1].public_name)
+            mask ^= lowest
+        return names
 
     @updated_fields.setter
     def updated_fields(self, value: list[str]):
-        self._updated_fields = set(value)
-
-    _fields: ClassVar[list["Field[Any]"]] = []
+        indices = {field.public_name: field.index for field in self._fields}
+        self._updated_mask = 0
+        for name in value:
+            self._updated_mask |= 1 << indices[name]
 
     def reset_updated(self):
-        self.updated = False
-        self.updated_fields.clear()
+        self._updated_mask = 0
 
 
 @dataclass(kw_only=True)
@@ -43,7 +60,7 @@ class Field[T]:
 
     def __set_name__[T_PROPS: UpdatableProps](self, owner: type[T_PROPS], name: str):
         self.public_name = name
-        self.private_name = f"_{name}"
+        self.index = len(owner._fields)
         owner._fields = [*owner._fields, self]
 
     def __set__(self, instance: UpdatableProps, value: Any):
@@ -56,12 +73,12 @@ class Field[T]:
                 f"of {UpdatableProps.__name__}"
             )
 
-        if value == getattr(instance, self.public_name):
+        values = instance._field_values
+        if value == values[self.index]:
             return
 
-        setattr(instance, self.private_name, value)
-        instance.updated = True
-        instance.updated_fields.add(self.public_name)
+        values[self.index] = value
+        instance._updated_mask |= 1 << self.index
 
     @overload
     def __get__(self, instance: None, owner: type[UpdatableProps]) -> Self: ...
@@ -76,4 +93,4 @@ class Field[T]:
     ) -> T | Self | None:
         if instance is None:
             return self
-        return getattr(instance, self.private_name, None)
+        return instance._field_values[self.index]
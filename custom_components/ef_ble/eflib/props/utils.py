@@ -1,4 +1,5 @@
 import functools
+import struct
 from collections.abc import Callable
 
 
@@ -9,6 +10,11 @@ def pround(precision: int = 2):
     return _round
 
 
+def to_float32(value: float) -> float:
+    """Round value to single precision, as it is reported by float protobuf fields"""
+    return struct.unpack("<f", struct.pack("<f", value))[0]
+
+
 class classproperty[T]:
     def __init__(self, method: Callable[..., T]):
         self.method = method
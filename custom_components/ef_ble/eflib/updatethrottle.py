@@ -0,0 +1,82 @@
+import asyncio
+import time
+from collections.abc import Callable
+
+
+class UpdateThrottle:
+    """
+    Limits how often property updates are delivered to a single flush per period
+
+    The first updates after a quiet period are delivered right away. Updates arriving
+    within the period mark their properties dirty, and all of them are delivered
+    together by a flush scheduled at the end of the period. Because the flush is
+    scheduled on the event loop, the last values before the device goes quiet are
+    delivered as well and don't wait for the next packet.
+    """
+
+    def __init__(self, flush: Callable[[set[str]], None], period: float = 0) -> None:
+        self._flush = flush
+        self._period = period
+        self._dirty: set[str] = set()
+        self._timer: asyncio.Handle | None = None
+        self._last_flush: float | None = None
+
+        self.delivered = 0
+        self.suppressed = 0
+
+    @property
+    def period(self):
+        return self._period
+
+    @period.setter
+    def period(self, period: float):
+        self._period = period
+        if period == 0:
+            self.flush()
+
+    def mark(self, propname: str):
+        """Mark property as updated, its callbacks run on the next flush"""
+        if propname in self._dirty:
+            # Previous value of this property is replaced before it was delivered
+            self.suppressed += 1
+        self._dirty.add(propname)
+
+        if self._period == 0:
+            self.flush()
+            return
+
+        if self._timer is not None:
+            return
+
+        loop = asyncio.get_running_loop()
+        if (
+            self._last_flush is None
+            or (delay := self._last_flush + self._period - time.monotonic()) <= 0
+        ):
+            # Flushing on the next iteration lets all fields from the same packet be
+            # delivered together
+            self._timer = loop.call_soon(self.flush)
+        else:
+            self._timer = loop.call_later(delay, self.flush)
+
+    def flush(self):
+        """Deliver all dirty properties now"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        if not self._dirty:
+            return
+
+        self._last_flush = time.monotonic()
+        dirty, self._dirty = self._dirty, set()
+        self.delivered += len(dirty)
+        self._flush(dirty)
+
+    def stats(self) -> dict[str, float | int]:
+        return {
+            "period": self._period,
+            "delivered": self.delivered,
+            "suppressed": self.suppressed,
+            "pending": len(self._dirty),
+        }
@@ -0,0 +1,220 @@
+import asyncio
+import contextlib
+import heapq
+import itertools
+import time
+from collections import deque
+from collections.abc import Hashable
+from dataclasses import dataclass, field
+from enum import IntEnum
+
+
+class WritePriority(IntEnum):
+    """Order in which queued writes are sent to the device, lowest value first"""
+
+    COMMAND = 0
+    TIME_SYNC = 1
+    REPLY = 2
+
+
+@dataclass(slots=True)
+class QueuedWrite:
+    priority: WritePriority
+    data: bytes | None
+    key: Hashable | None
+    queued_at: float
+    done: asyncio.Future[None] = field(
+        default_factory=lambda: asyncio.get_running_loop().create_future()
+    )
+    order: int = 0
+    attempt: int = 0
+
+
+class WriteQueue:
+    """
+    Bounded priority queue of GATT writes drained by a single writer
+
+    Writes are sent in priority order and in FIFO order within the same priority. When
+    the queue is full, queued replies are dropped to make room for commands and time
+    sync, while commands wait for free space. A reply queued with the same key as one
+    that was not sent yet replaces its data, as the device only needs the latest one.
+    Failed writes can be retried after a delay, other writes are sent in the meantime.
+    """
+
+    def __init__(self, maxsize: int = 32, latency_samples: int = 50):
+        self._maxsize = maxsize
+        self._heap: list[tuple[int, int, QueuedWrite]] = []
+        # Writes waiting for retry, by the time they can be sent again
+        self._delayed: list[tuple[float, int, QueuedWrite]] = []
+        self._order = itertools.count()
+        self._pending_keys: dict[Hashable, QueuedWrite] = {}
+        self._size = 0
+        self._not_empty = asyncio.Event()
+        self._not_full = asyncio.Event()
+        self._not_full.set()
+
+        self.max_depth = 0
+        self.sent = 0
+        self.dropped = 0
+        self.superseded = 0
+        self.retried = 0
+        self._latencies: deque[float] = deque(maxlen=latency_samples)
+
+    def __len__(self):
+        return self._size
+
+    async def put(
+        self,
+        data: bytes,
+        priority: WritePriority = WritePriority.COMMAND,
+        key: Hashable | None = None,
+    ) -> asyncio.Future[None]:
+        """
+        Queue data to write
+
+        Parameters
+        ----------
+        data
+            Raw bytes to write to the characteristic
+        priority
+            Priority of the write
+        key
+            Writes with the same key that are still waiting in the queue are replaced
+            by this one
+
+        Return
+        -------
+        Future that is resolved after the data was written or dropped
+        """
+        if key is not None and (queued := self._pending_keys.get(key)) is not None:
+            queued.data = data
+            self.superseded += 1
+            return queued.done
+
+        while self._size >= self._maxsize:
+            if priority is WritePriority.REPLY or not self._drop_reply():
+                if priority is WritePriority.REPLY:
+                    # Replies are sent from the notification handler, which shouldn't
+                    # block, so they are dropped instead of waiting
+                    self.dropped += 1
+                    write = QueuedWrite(priority, None, None, time.monotonic())
+                    write.done.set_result(None)
+                    return write.done
+
+                self._not_full.clear()
+                await self._not_full.wait()
+
+        write = QueuedWrite(priority, data, key, time.monotonic())
+        write.order = next(self._order)
+        heapq.heappush(self._heap, (priority, write.order, write))
+        if key is not None:
+            self._pending_keys[key] = write
+
+        self._size += 1
+        self.max_depth = max(self.max_depth, self._size)
+        self._not_empty.set()
+        return write.done
+
+    async def get(self) -> QueuedWrite:
+        """Wait for the next write that can be sent"""
+        while True:
+            self._release_delayed()
+            if not self._heap:
+                self._not_empty.clear()
+                timeout = (
+                    self._delayed[0][0] - time.monotonic() if self._delayed else None
+                )
+                with contextlib.suppress(TimeoutError):
+                    async with asyncio.timeout(timeout):
+                        await self._not_empty.wait()
+                continue
+
+            _, _, write = heapq.heappop(self._heap)
+            if write.data is None:
+                # Dropped while waiting in the queue
+                continue
+
+            self._size -= 1
+            if write.key is not None:
+                del self._pending_keys[write.key]
+            self._not_full.set()
+            return write
+
+    def retry(self, write: QueuedWrite, delay: float):
+        """
+        Queue write that failed again after delay
+
+        It keeps its place among writes of the same priority and its `done` future is
+        resolved only after it is finally written or dropped.
+        """
+        write.attempt += 1
+        self.retried += 1
+        # Retries don't wait for free space, as that would block the writer
+        heapq.heappush(self._delayed, (time.monotonic() + delay, write.order, write))
+        self._size += 1
+        self.max_depth = max(self.max_depth, self._size)
+        self._not_empty.set()
+
+    def drop(self, write: QueuedWrite):
+        """Give up on write that was taken from the queue"""
+        self.dropped += 1
+        if not write.done.done():
+            write.done.set_result(None)
+
+    def _release_delayed(self):
+        now = time.monotonic()
+        while self._delayed and self._delayed[0][0] <= now:
+            _, order, write = heapq.heappop(self._delayed)
+            heapq.heappush(self._heap, (write.priority, order, write))
+
+    def record_latency(self, queued_at: float):
+        """Record time from queueing to finished write"""
+        self.sent += 1
+        self._latencies.append(time.monotonic() - queued_at)
+
+    def clear(self):
+        """Drop all queued writes, e.g. when the connection is lost"""
+        for _, _, write in self._heap + self._delayed:
+            if not write.done.done():
+                write.done.set_result(None)
+        self._heap.clear()
+        self._delayed.clear()
+        self._pending_keys.clear()
+        self._size = 0
+        self._not_full.set()
+
+    def stats(self) -> dict[str, float | int | None]:
+        """Return queue depth and write latency statistics"""
+        latencies = sorted(self._latencies)
+        return {
+            "depth": self._size,
+            "max_depth": self.max_depth,
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "superseded": self.superseded,
+            "retried": self.retried,
+            "latency_median_ms": (
+                latencies[len(latencies) // 2] * 1000 if latencies else None
+            ),
+            "latency_max_ms": latencies[-1] * 1000 if latencies else None,
+        }
+
+    def _drop_reply(self) -> bool:
+        # Lowest priority entry that is still waiting is the one with the largest
+        # (priority, order), there are at most maxsize entries so linear scan is fine
+        candidates = [
+            entry
+            for entry in self._heap
+            if entry[2].data is not None and entry[2].priority is WritePriority.REPLY
+        ]
+        if not candidates:
+            return False
+
+        _, _, write = max(candidates, key=lambda entry: entry[1])
+        write.data = None
+        if write.key is not None:
+            del self._pending_keys[write.key]
+        write.done.set_result(None)
+        self._size -= 1
+        self.dropped += 1
+        return True
@@ -275,6 +275,8 @@ class EcoflowNumber(EcoflowEntity, NumberEntity):
         self._availability_prop = entity_description.availability_prop
         self._set_native_value = entity_description.async_set_native_value
         self._prop_name = entity_description.key
+        # Slider movements are debounced, so only the last value is sent
+        self._writer = device.coalescing_writer(self._prop_name)
         self._attr_native_value = getattr(device, self._prop_name)
 
         if entity_description.translation_key is None:
@@ -309,8 +311,12 @@ class EcoflowNumber(EcoflowEntity, NumberEntity):
         return self._attr_available
 
     async def async_set_native_value(self, value: float) -> None:
-        if self._set_native_value is not None:
-            await self._set_native_value(self._device, value)
+        if (set_native_value := self._set_native_value) is not None:
+            await self._device.write_optimistic(
+                self._prop_name,
+                value,
+                self._writer.write(lambda: set_native_value(self._device, value)),
+            )
             return
 
         await super().async_set_native_value(value)
@@ -1,5 +1,6 @@
 from collections.abc import Awaitable, Callable
 from dataclasses import dataclass
+from enum import Enum
 
 from homeassistant.components.select import (
     SelectEntity,
@@ -226,7 +227,17 @@ class EcoflowSelect(EcoflowEntity, SelectEntity):
 
     async def async_select_option(self, option: str) -> None:
         if self._set_state is not None:
-            await self._set_state(self._device, option)
+            write = self._set_state(self._device, option)
+            current = getattr(self._device, self._prop_name, None)
+            if (
+                isinstance(current, Enum)
+                and option.upper() in type(current).__members__
+            ):
+                await self._device.write_optimistic(
+                    self._prop_name, type(current)[option.upper()], write
+                )
+            else:
+                await write
             return
 
         await super().async_select_option(option)
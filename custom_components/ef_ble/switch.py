@@ -152,10 +152,14 @@ class EcoflowSwitchEntity(EcoflowEntity, SwitchEntity):
             self._attr_translation_key = self.entity_description.key
 
     async def async_turn_on(self, **kwargs: Any) -> None:
-        await getattr(self._device, self._method_name)(True)
+        await self._device.write_optimistic(
+            self._prop_name, True, getattr(self._device, self._method_name)(True)
+        )
 
     async def async_turn_off(self, **kwargs: Any) -> None:
-        await getattr(self._device, self._method_name)(False)
+        await self._device.write_optimistic(
+            self._prop_name, False, getattr(self._device, self._method_name)(False)
+        )
 
     async def async_added_to_hass(self) -> None:
         self._device.register_state_update_callback(self.state_updated, self._prop_name)